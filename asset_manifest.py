@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+
+class AssetManifest:
+    """Content fingerprints of the files in a static folder.
+
+    `url()` gives a static URL with `?v=<hash>` appended. A request that
+    carries a file's current hash may be cached for a year without
+    revalidation (`cache_control()`), because any edit changes the URL.
+    Files under `hashed_dirs` already have the hash in their names and
+    are always immutable. Anything else gets `no-cache`, so browsers
+    revalidate with the ETag and get a 304. Hashes are kept per (mtime,
+    size), so an edited file gets a new URL without a restart.
+    """
+
+    def __init__(self, root: str, url_prefix: str = "/static", hashed_dirs: Tuple[str, ...] = ()) -> None:
+        self.root = os.path.abspath(root)
+        self.url_prefix = url_prefix.rstrip("/")
+        self.hashed_dirs = hashed_dirs
+        self._lock = threading.Lock()
+        self._hashes: Dict[str, Tuple[int, int, str]] = {}
+
+    def build(self) -> int:
+        """Fingerprint every file up front; returns how many were hashed."""
+        for dirpath, _dirnames, filenames in os.walk(self.root):
+            rel_dir = os.path.relpath(dirpath, self.root).replace(os.sep, "/")
+            prefix = "" if rel_dir == "." else rel_dir + "/"
+            if prefix.startswith(self.hashed_dirs):
+                continue
+            for name in filenames:
+                self.version(prefix + name)
+        return len(self._hashes)
+
+    def version(self, filename: str) -> Optional[str]:
+        """Short content hash of a file under the root (None if it does not exist)."""
+        path = os.path.normpath(os.path.join(self.root, filename))
+        if not path.startswith(self.root + os.sep):
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        cached = self._hashes.get(filename)
+        if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2]
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 16), b""):
+                digest.update(block)
+        version = digest.hexdigest()[:12]
+        with self._lock:
+            self._hashes[filename] = (st.st_mtime_ns, st.st_size, version)
+        return version
+
+    def versions(self) -> Dict[str, str]:
+        """filename -> hash of every file fingerprinted so far."""
+        with self._lock:
+            return {filename: entry[2] for filename, entry in self._hashes.items()}
+
+    def url(self, filename: str) -> str:
+        version = self.version(filename)
+        url = f"{self.url_prefix}/{filename}"
+        return f"{url}?v={version}" if version else url
+
+    def cache_control(self, filename: str, version: Optional[str]) -> str:
+        """Cache-Control for serving `filename` requested with `?v=version`."""
+        if filename.startswith(self.hashed_dirs):
+            return IMMUTABLE
+        return IMMUTABLE if version and version == self.version(filename) else REVALIDATE
@@ -0,0 +1,92 @@
+"""Fallback-choice sampling: the old rebuild-and-shuffle picker vs ChoiceBank.
+
+Runs both against the real choice banks in content/content.json with a full 60-entry choice
+history, the way `_fallback_scene` calls them (1 sustainable + 3 others).
+
+    python benchmarks/bench_choice_bank.py --rounds 20000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from choice_bank import ChoiceBank  # noqa: E402
+
+
+def legacy_pick(bank: Dict[str, List[Dict[str, Any]]], count: int, history: Deque[str]) -> List[Dict[str, Any]]:
+    """The picker ChoiceBank replaced, kept here as the baseline."""
+    all_choices: List[Dict[str, Any]] = []
+    categories = list(bank.keys())
+    random.shuffle(categories)
+    for cat in categories:
+        for item in bank[cat]:
+            all_choices.append({**item, "_category": cat})
+    random.shuffle(all_choices)
+
+    history_set = set(history)
+    fresh = [c for c in all_choices if c["text"] not in history_set]
+    stale = [c for c in all_choices if c["text"] in history_set]
+
+    picked: List[Dict[str, Any]] = []
+    used_cats: set = set()
+    for c in fresh:
+        if len(picked) >= count:
+            break
+        if c["_category"] not in used_cats:
+            picked.append(c)
+            used_cats.add(c["_category"])
+    for c in fresh + stale:
+        if len(picked) >= count:
+            break
+        if c not in picked:
+            picked.append(c)
+    for c in picked:
+        c.pop("_category", None)
+    return picked[:count]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20000)
+    args = parser.parse_args()
+
+    with open(os.path.join(ROOT, "content", "content.json"), encoding="utf-8") as f:
+        content = json.load(f)
+    sustainable_bank = content["sustainable_choices"]
+    unsustainable_bank = content["unsustainable_choices"]
+
+    history: Deque[str] = deque(maxlen=60)
+    texts = [item["text"] for items in unsustainable_bank.values() for item in items]
+    texts += [item["text"] for items in sustainable_bank.values() for item in items]
+    history.extend(random.sample(texts, 60))
+
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        legacy_pick(sustainable_bank, 1, history)
+        legacy_pick(unsustainable_bank, 3, history)
+    legacy = (time.perf_counter() - start) / args.rounds
+
+    sustainable = ChoiceBank(sustainable_bank)
+    unsustainable = ChoiceBank(unsustainable_bank)
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        sustainable.sample(1, history)
+        unsustainable.sample(3, history)
+    compiled = (time.perf_counter() - start) / args.rounds
+
+    print(f"bank sizes: {len(sustainable)} sustainable, {len(unsustainable)} unsustainable")
+    print(f"legacy picker:  {legacy * 1e6:8.2f} us per fallback scene")
+    print(f"ChoiceBank:     {compiled * 1e6:8.2f} us per fallback scene ({legacy / compiled:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
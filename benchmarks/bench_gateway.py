@@ -0,0 +1,170 @@
+"""Scene-generation throughput through LLMGateway against a local latency stub.
+
+Two comparisons, each at equal model-call concurrency so only the calling
+model differs:
+
+* direct: N threads each blocked on a sync call vs. the gateway with
+  N calls in flight, submitted from one thread;
+* prefetch: the app's call path, a GenerationPool filling session queues,
+  with jobs that block a worker on `create()` (the old producer) vs. jobs
+  that `submit()` and finish in a pool continuation (the current one).
+  Blocking jobs need one worker thread per call in flight; submitted ones
+  reach the same concurrency with a few threads.
+
+Throughput should come out about the same in every row; what differs is the
+threads it takes (callers only, not counting the gateway's loop thread).
+
+    python benchmarks/bench_gateway.py --calls 200 --latency-ms 1500 --concurrency 8
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import concurrent.futures
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llm_gateway import LLMGateway  # noqa: E402
+from prefetch import GenerationPool, SceneQueue  # noqa: E402
+
+SCENE_JSON = '{"scene": "stub", "choices": []}'
+
+
+class _Response:
+    output_text = SCENE_JSON
+
+
+class _StubResponses:
+    def __init__(self, latency: float, jitter: float) -> None:
+        self.latency = latency
+        self.jitter = jitter
+
+    def _delay(self) -> float:
+        return max(0.0, random.gauss(self.latency, self.latency * self.jitter))
+
+    async def create(self, **kwargs):
+        await asyncio.sleep(self._delay())
+        return _Response()
+
+    def create_sync(self, **kwargs):
+        time.sleep(self._delay())
+        return _Response()
+
+
+class StubAsyncClient:
+    def __init__(self, latency: float, jitter: float = 0.2) -> None:
+        self.responses = _StubResponses(latency, jitter)
+
+
+def _gateway(latency: float, in_flight: int, per_session: int) -> LLMGateway:
+    gateway = LLMGateway(lambda: StubAsyncClient(latency), in_flight, per_session)
+    gateway.create("warmup", model="stub")  # start the loop outside the timing
+    return gateway
+
+
+def bench_threads(calls: int, threads: int, latency: float) -> float:
+    stub = _StubResponses(latency, 0.2)
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(threads) as pool:
+        list(pool.map(lambda _: stub.create_sync(), range(calls)))
+    return calls / (time.perf_counter() - start)
+
+
+def bench_gateway(calls: int, sessions: int, latency: float, in_flight: int, per_session: int) -> float:
+    gateway = _gateway(latency, in_flight, per_session)
+    start = time.perf_counter()
+    futures = [gateway.submit(f"s{i % sessions}", model="stub") for i in range(calls)]
+    for f in futures:
+        f.result()
+    return calls / (time.perf_counter() - start)
+
+
+def bench_pool(
+    calls: int, sessions: int, latency: float, concurrency: int, per_session: int, workers: int, submit: bool
+) -> float:
+    """Scenes/s filling `sessions` queues to `calls` scenes in total, one scene per job."""
+    gateway = _gateway(latency, concurrency, per_session)
+    scene = {"scene": "stub", "choices": []}
+    filled = threading.Event()
+    produced = [0]
+    lock = threading.Lock()
+
+    def put(queue: SceneQueue) -> None:
+        queue.put(0, scene)
+        with lock:
+            produced[0] += 1
+            if produced[0] >= calls:
+                filled.set()
+
+    def generate_blocking(sid: str, queue: SceneQueue, count: int) -> bool:
+        gateway.create(sid, model="stub")
+        put(queue)
+        return True
+
+    def generate_submitted(sid: str, queue: SceneQueue, count: int) -> "concurrent.futures.Future[bool]":
+        done: concurrent.futures.Future = concurrent.futures.Future()
+
+        def returned(call: concurrent.futures.Future) -> None:
+            call.result()
+            put(queue)
+            done.set_result(True)
+
+        gateway.submit(sid, model="stub").add_done_callback(
+            lambda call: pool.call_soon(lambda: returned(call))
+        )
+        return done
+
+    pool = GenerationPool(
+        workers=workers,
+        generate=generate_submitted if submit else generate_blocking,
+        max_jobs=concurrency,
+    )
+    queues = [SceneQueue(target=-(-calls // sessions)) for _ in range(sessions)]
+    start = time.perf_counter()
+    for i, queue in enumerate(queues):
+        pool.wake(f"s{i}", queue)
+    filled.wait()
+    return calls / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=1500)
+    parser.add_argument("--concurrency", type=int, default=8, help="model calls in flight, in every mode")
+    parser.add_argument("--workers", type=int, default=2, help="pool threads for submitted prefetch jobs")
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--per-session", type=int, default=2)
+    args = parser.parse_args()
+    latency = args.latency_ms / 1000
+    n = args.concurrency
+
+    print(f"{args.calls} calls, ~{args.latency_ms:.0f} ms each, {n} in flight")
+    rows = [
+        ("direct", f"{n} blocking threads", n, bench_threads(args.calls, n, latency)),
+        ("direct", "gateway submit()", 1, bench_gateway(args.calls, args.sessions, latency, n, args.per_session)),
+        (
+            "prefetch",
+            f"pool, {n} workers on create()",
+            n,
+            bench_pool(args.calls, args.sessions, latency, n, args.per_session, n, submit=False),
+        ),
+        (
+            "prefetch",
+            f"pool, {args.workers} workers + submit()",
+            args.workers,
+            bench_pool(args.calls, args.sessions, latency, n, args.per_session, args.workers, submit=True),
+        ),
+    ]
+    print(f"{'':<9} {'':<34} {'threads':>7} {'scenes/s':>9}")
+    for path, label, threads, rate in rows:
+        print(f"{path:<9} {label:<34} {threads:>7} {rate:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
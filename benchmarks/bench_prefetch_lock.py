@@ -0,0 +1,131 @@
+"""Consumer latency on a full prefetch queue while its producer is parked.
+
+Reproduces the old failure mode (a producer waiting for room while the queue
+is full) and reports how long consumers wait on the queue lock, using the
+same LockStats instrumentation exposed by /api/prefetch_status. The `old`
+mode replays the original worker, which slept while holding the lock when
+the queue was full; `new` is SceneQueue with the producer parked outside it.
+
+    python benchmarks/bench_prefetch_lock.py --seconds 3
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prefetch import InstrumentedLock, LockStats, SceneQueue, percentile  # noqa: E402
+
+
+class _LegacyQueue:
+    """The pre-SceneQueue prefetch queue: a list behind one lock, whose producer
+    sleeps with the lock held while the queue is full."""
+
+    def __init__(self, target: int, stats: LockStats, full_sleep: float) -> None:
+        self.target = target
+        self.full_sleep = full_sleep
+        self.lock = InstrumentedLock(stats)
+        self.items: List[Dict[str, Any]] = []
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self.items)
+
+    def wait_for_space(self) -> bool:
+        with self.lock:
+            if len(self.items) >= self.target:
+                time.sleep(self.full_sleep)  # queue full: sleep without releasing the lock
+                return False
+        return True
+
+    def put(self, boss_index: int, scene: Dict[str, Any]) -> None:
+        with self.lock:
+            self.items.append({"boss_index": boss_index, **scene})
+
+    def take(self, boss_index: int) -> Any:
+        with self.lock:
+            for i, scene in enumerate(self.items):
+                if scene.get("boss_index") == boss_index:
+                    del self.items[i]
+                    return scene
+            return None
+
+
+def run(mode: str, args: argparse.Namespace) -> Tuple[List[float], LockStats]:
+    stats = LockStats()
+    scene = {"scene": "x", "choices": []}
+    stop = threading.Event()
+    latencies: List[float] = []
+
+    if mode == "old":
+        queue: Any = _LegacyQueue(target=8, stats=stats, full_sleep=args.full_sleep_ms / 1000)
+
+        def producer() -> None:
+            while not stop.is_set():
+                if queue.wait_for_space():
+                    time.sleep(args.gen_ms / 1000)  # "model call", outside the lock as before
+                    queue.put(0, scene)
+    else:
+        queue = SceneQueue(target=8, stats=stats)
+        space = threading.Event()
+        queue.listener = space.set  # consumers wake the producer, as the pool does
+
+        def producer() -> None:
+            while not stop.is_set():
+                if len(queue) >= queue.target:
+                    space.wait(0.1)  # parked without the queue lock
+                    space.clear()
+                    continue
+                time.sleep(args.gen_ms / 1000)  # "model call", outside the lock
+                queue.put(0, scene)
+
+    def consumer() -> None:
+        while not stop.is_set():
+            start = time.perf_counter()
+            queue.take(0)
+            len(queue)
+            latencies.append(time.perf_counter() - start)
+            time.sleep(args.think_ms / 1000)
+
+    threads = [threading.Thread(target=producer)]
+    threads += [threading.Thread(target=consumer) for _ in range(args.consumers)]
+    for t in threads:
+        t.start()
+    time.sleep(args.seconds)
+    stop.set()
+    if mode == "new":
+        queue.close()
+    for t in threads:
+        t.join()
+    return latencies, stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--consumers", type=int, default=4)
+    parser.add_argument("--gen-ms", type=float, default=5.0, help="simulated generation time")
+    parser.add_argument("--think-ms", type=float, default=50.0, help="pause between a consumer's calls")
+    parser.add_argument("--full-sleep-ms", type=float, default=500.0, help="old worker's sleep on a full queue")
+    parser.add_argument("--mode", choices=("both", "old", "new"), default="both")
+    args = parser.parse_args()
+
+    modes = ("old", "new") if args.mode == "both" else (args.mode,)
+    print(f"{'':<5} {'calls':>7} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9} {'lock wait p99':>14} {'lock hold p99':>14}")
+    for mode in modes:
+        latencies, stats = run(mode, args)
+        snapshot = stats.snapshot()
+        print(
+            f"{mode:<5} {len(latencies):>7} {percentile(latencies, 0.5) * 1000:>9.3f} "
+            f"{percentile(latencies, 0.99) * 1000:>9.3f} {max(latencies, default=0.0) * 1000:>9.3f} "
+            f"{snapshot['lock_wait_ms']['p99']:>14.3f} {snapshot['lock_hold_ms']['p99']:>14.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
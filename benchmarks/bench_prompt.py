@@ -0,0 +1,292 @@
+"""Scene prompts: the old interleaved prompt vs the static prefix + short suffix.
+
+Offline it reports input tokens per generated scene for one-scene and batch
+requests, old vs new. Tokens are counted with tiktoken if it is installed,
+otherwise estimated as chars / 4.
+
+With --live N (needs OPENAI_API_KEY; honours OPENAI_BASE_URL) it also sends
+N one-scene requests of each kind and reports the provider's token usage
+and latency per valid scene.
+
+    python benchmarks/bench_prompt.py --batch 4 --live 10
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import deque
+from typing import Any, Callable, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["SCENE_CACHE_PATH"] = ""
+os.environ["SCENE_CORPUS_PATH"] = ""
+os.environ["BOSS_IMAGE_VARIANTS"] = "0"
+
+import app  # noqa: E402
+from scene_schema import validate_and_normalize_scene  # noqa: E402
+
+try:
+    import tiktoken
+
+    _ENCODING = tiktoken.get_encoding("o200k_base")
+
+    def count_tokens(text: str) -> int:
+        return len(_ENCODING.encode(text))
+
+    TOKENS = "tokens"
+except ImportError:
+
+    def count_tokens(text: str) -> int:
+        return (len(text) + 3) // 4
+
+    TOKENS = "tokens (est. chars/4)"
+
+
+# === The prompts before the static-prefix split, kept as the baseline === #
+def _legacy_recent_choice_hint(state: Dict[str, Any]) -> str:
+    if not state["choice_history"]:
+        return ""
+    recent_samples = list(state["choice_history"])[-12:]
+    return (
+        "\nDO NOT reuse any of these recent choice texts:\n"
+        + "\n".join(f"  - \"{t}\"" for t in recent_samples)
+        + "\n"
+    )
+
+
+def legacy_scene_prompt(boss: app.Boss, player: app.Player, difficulty: str, state: Dict[str, Any]) -> str:
+    sustainable_needed = app._difficulty_settings(difficulty)["sustainable_choices"]
+    style_instruction = random.choice(app._NARRATIVE_STYLES)
+    required_topics = random.sample(app._CHOICE_TOPICS, 4)
+    recent_hints = _legacy_recent_choice_hint(state)
+    return f"""
+Boss Name: {boss.name}
+Boss Category: {boss.category}
+Difficulty: {difficulty}
+
+Current Stats:
+- Player HP: {player.hp}
+- Boss HP: {boss.hp}
+
+NARRATIVE STYLE: {style_instruction}
+
+Create an engaging battle scene (3-5 sentences) about confronting {boss.name}.
+Then provide 4 distinct action choices (A-D), each ONE SENTENCE (max 10 words).
+
+CHOICE TOPICS (you MUST use these 4 specific topics, one per choice):
+1. {required_topics[0]}
+2. {required_topics[1]}
+3. {required_topics[2]}
+4. {required_topics[3]}
+
+CHOICE VARIETY RULES:
+- EXACTLY {sustainable_needed} choices must be sustainable (eco-friendly).
+- The remaining choices must be unsustainable (wasteful/harmful).
+- Each of the 4 choices MUST cover its assigned topic above.
+- RANDOMIZE the position of sustainable vs unsustainable choices.
+- Use DIFFERENT verbs and scenarios than common examples.
+{recent_hints}
+JSON STRUCTURE (choices A-D must be in this exact format):
+{{
+  "scene": "A vivid 3-5 sentence battle scene description.",
+  "choices": [
+    {{
+      "id": "A",
+      "text": "One specific action about {required_topics[0]} (max 10 words).",
+      "is_sustainable": true,
+      "delta_player": {{"hp": 0}},
+      "delta_boss": {{"hp": -12}}
+    }},
+    {{
+      "id": "B",
+      "text": "Different action about {required_topics[1]} (max 10 words).",
+      "is_sustainable": false,
+      "delta_player": {{"hp": -4}},
+      "delta_boss": {{"hp": -1}}
+    }},
+    {{
+      "id": "C",
+      "text": "Another action about {required_topics[2]} (max 10 words).",
+      "is_sustainable": false,
+      "delta_player": {{"hp": -5}},
+      "delta_boss": {{"hp": 0}}
+    }},
+    {{
+      "id": "D",
+      "text": "Final action about {required_topics[3]} (max 10 words).",
+      "is_sustainable": true,
+      "delta_player": {{"hp": 0}},
+      "delta_boss": {{"hp": -10}}
+    }}
+  ]
+}}
+
+REMINDERS:
+- Choice text must be concise (under 10 words).
+- Return ONLY valid JSON, no extra text.
+- All 4 choices must teach different lessons about their assigned topics.
+- RANDOMIZE order: Do NOT put all sustainable choices first or all unsustainable choices last.
+""".strip()
+
+
+def legacy_batch_prompt(
+    boss: app.Boss, player: app.Player, difficulty: str, state: Dict[str, Any], count: int
+) -> str:
+    sustainable_needed = app._difficulty_settings(difficulty)["sustainable_choices"]
+    styles = random.sample(app._NARRATIVE_STYLES, min(count, len(app._NARRATIVE_STYLES)))
+    plans = []
+    for i in range(count):
+        topics = random.sample(app._CHOICE_TOPICS, 4)
+        plans.append(f"Scene {i + 1}: {styles[i % len(styles)]} Choice topics A-D: {', '.join(topics)}.")
+    plan_lines = "\n".join(plans)
+    return f"""
+Boss Name: {boss.name}
+Boss Category: {boss.category}
+Difficulty: {difficulty}
+
+Current Stats:
+- Player HP: {player.hp}
+- Boss HP: {boss.hp}
+
+Create {count} DIFFERENT battle scenes about confronting {boss.name}.
+Each scene is 3-5 sentences with 4 distinct action choices (A-D), each ONE SENTENCE (max 10 words).
+The scenes must not share settings, verbs or choice texts with each other.
+
+SCENE PLANS (one per scene, in order):
+{plan_lines}
+
+CHOICE VARIETY RULES (for EVERY scene):
+- EXACTLY {sustainable_needed} choices must be sustainable (eco-friendly).
+- The remaining choices must be unsustainable (wasteful/harmful).
+- Each choice MUST cover its assigned topic from the scene plan.
+- RANDOMIZE the position of sustainable vs unsustainable choices.
+{_legacy_recent_choice_hint(state)}
+JSON STRUCTURE:
+{{
+  "scenes": [
+    {{
+      "scene": "A vivid 3-5 sentence battle scene description.",
+      "choices": [
+        {{"id": "A", "text": "Action (max 10 words).", "is_sustainable": true, "delta_player": {{"hp": 0}}, "delta_boss": {{"hp": -12}}}},
+        {{"id": "B", "text": "Action (max 10 words).", "is_sustainable": false, "delta_player": {{"hp": -4}}, "delta_boss": {{"hp": -1}}}},
+        {{"id": "C", "text": "Action (max 10 words).", "is_sustainable": false, "delta_player": {{"hp": -5}}, "delta_boss": {{"hp": 0}}}},
+        {{"id": "D", "text": "Action (max 10 words).", "is_sustainable": true, "delta_player": {{"hp": 0}}, "delta_boss": {{"hp": -10}}}}
+      ]
+    }}
+  ]
+}}
+
+REMINDERS:
+- The "scenes" array must contain exactly {count} scenes.
+- Sustainable choices: delta_player hp 0, delta_boss hp -9 to -12.
+- Unsustainable choices: delta_player hp -3 to -6, delta_boss hp 0 to -2.
+- Return ONLY valid JSON, no extra text.
+""".strip()
+
+
+def legacy_request(prompt: str) -> Dict[str, Any]:
+    return {
+        "model": "gpt-5-mini",
+        "input": [{"role": "system", "content": app.SYSTEM}, {"role": "user", "content": prompt}],
+    }
+
+
+# === Measurements === #
+def _request_text(request: Dict[str, Any]) -> str:
+    return "\n".join(message["content"] for message in request["input"])
+
+
+def _new_state() -> Dict[str, Any]:
+    bank = app._content().sustainable
+    texts = [bank.choice(i)["text"] for i in range(len(bank))]
+    return {"choice_history": deque(random.sample(texts, 12), maxlen=60)}
+
+
+def offline(
+    make_before: Callable[[], Dict[str, Any]],
+    make_after: Callable[[], Dict[str, Any]],
+    scenes: int,
+    samples: int = 50,
+) -> None:
+    per_scene = {}
+    for label, make_request in (("before", make_before), ("after", make_after)):
+        total = sum(count_tokens(_request_text(make_request())) for _ in range(samples)) / samples
+        per_scene[label] = total / scenes
+        print(f"  {label:<8} {per_scene[label]:7.1f} input {TOKENS} per scene")
+    saved = 1 - per_scene["after"] / per_scene["before"]
+    print(f"  {'saved':<8} {per_scene['before'] - per_scene['after']:7.1f} per scene ({saved:.0%})")
+
+
+def live(label: str, make_request: Callable[[], Dict[str, Any]], calls: int) -> None:
+    from openai import OpenAI
+
+    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0)
+    sustainable_needed = app._difficulty_settings("medium")["sustainable_choices"]
+    valid = input_tokens = output_tokens = 0
+    elapsed = 0.0
+    for _ in range(calls):
+        start = time.perf_counter()
+        try:
+            response = client.responses.create(**make_request())
+        except Exception as e:
+            print(f"  {label}: call failed: {e}")
+            continue
+        elapsed += time.perf_counter() - start
+        usage = response.usage
+        if usage is not None:
+            input_tokens += usage.input_tokens
+            output_tokens += usage.output_tokens
+        try:
+            validate_and_normalize_scene(app._extract_json_object(response.output_text), sustainable_needed)
+            valid += 1
+        except Exception:
+            pass
+    per = max(valid, 1)
+    print(
+        f"  {label:<8} {valid}/{calls} valid, per valid scene: {input_tokens / per:7.1f} input tokens, "
+        f"{output_tokens / per:7.1f} output tokens, "
+        f"{elapsed / per * 1000:7.0f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch", type=int, default=4, help="scenes per batch request")
+    parser.add_argument("--live", type=int, default=0, help="one-scene calls per prompt kind against the API")
+    args = parser.parse_args()
+
+    boss_name, category = app._content().bosses[0]
+    boss = app.Boss(name=boss_name, category=category, hp=100)
+    player = app.Player(hp=100)
+    state = _new_state()
+
+    def old_single() -> Dict[str, Any]:
+        return legacy_request(legacy_scene_prompt(boss, player, "medium", state))
+
+    def new_single() -> Dict[str, Any]:
+        return app._model_request(app.build_scene_prompt(boss, player, "medium", state))
+
+    def old_batch() -> Dict[str, Any]:
+        return legacy_request(legacy_batch_prompt(boss, player, "medium", state, args.batch))
+
+    def new_batch() -> Dict[str, Any]:
+        return app._model_request(app.build_batch_scene_prompt(boss, player, "medium", state, args.batch))
+
+    print("one scene per request:")
+    offline(old_single, new_single, 1)
+    print(f"{args.batch} scenes per request:")
+    offline(old_batch, new_batch, args.batch)
+
+    if args.live:
+        if not os.getenv("OPENAI_API_KEY"):
+            sys.exit("--live needs OPENAI_API_KEY")
+        print(f"live, {args.live} one-scene calls each:")
+        live("before", old_single, args.live)
+        live("after", new_single, args.live)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Requests/second of the /api/apply_choice loop as worker processes are added.
+
+Each worker process imports the app (like a gunicorn worker would) and plays
+games through Flask's test client against the chosen session store. The
+workers play the *same* games (every worker sends the same session cookies),
+the way a load balancer spreads one player's requests over the processes.
+With SESSION_STORE=sqlite all workers share one WAL database, so throughput
+should grow with the number of processes instead of being capped by one GIL.
+
+Afterwards each worker adds to one shared counter session through the store
+directly, and the lost updates (expected total minus actual) are reported.
+
+    python benchmarks/bench_session_workers.py --workers 1 2 4 --seconds 5
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import time
+from typing import Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _worker(store: str, db_path: str, games: int, seconds: float, increments: int, barrier, results) -> None:
+    os.environ["SESSION_STORE"] = store
+    os.environ["SESSION_DB_PATH"] = db_path
+    os.environ.pop("OPENAI_API_KEY", None)  # measure the app, not the model
+    os.environ["BOSS_IMAGE_VARIANTS"] = "0"  # nor image encoding
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    import app as game
+
+    clients = [game.app.test_client() for _ in range(games)]
+    for i, c in enumerate(clients):
+        c.set_cookie(game.SESSION_COOKIE, f"bench-game-{i}")  # same games in every worker
+    payloads = {}
+    for c in clients:
+        payloads[c] = c.post("/api/start", json={"username": "bench", "difficulty": "easy"}).get_json()
+
+    barrier.wait()
+    requests = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        for c in clients:
+            data = payloads[c]
+            outcome = data.get("outcome")
+            error = data.get("error", "")
+            # Another worker may have moved this game on since our last response
+            if outcome in ("victory", "player_defeated") or error == "Game not started.":
+                data = c.post("/api/start", json={"username": "bench", "difficulty": "easy"}).get_json()
+            elif outcome == "boss_defeated_choose_reward" or "claim your reward" in error:
+                data = c.post("/api/claim_reward", json={"reward_id": "health_restore"}).get_json()
+            else:
+                data = c.post("/api/apply_choice", json={"choice_id": "A"}).get_json()
+                requests += 1
+            payloads[c] = data
+
+    if store == "sqlite":
+        counters = _counter_store(db_path)
+        for _ in range(increments):
+            with counters.session("bench-counter", lambda: {"n": 0}) as counter:
+                counter["n"] += 1
+    results.put(requests)
+
+
+def _counter_store(db_path: str):
+    """A store on the app's database holding a plain JSON counter."""
+    sys.path.insert(0, ROOT)
+    from session_store import SqliteSessionStore
+
+    return SqliteSessionStore(db_path, lambda d: json.dumps(d).encode("utf-8"), json.loads)
+
+
+def run(store: str, workers: int, games: int, seconds: float, increments: int) -> Tuple[float, int]:
+    """Requests/second, and lost counter updates (sqlite only)."""
+    db_dir = tempfile.mkdtemp(prefix="bossrush-bench-")
+    db_path = os.path.join(db_dir, "sessions.db")
+    ctx = mp.get_context("spawn")
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(target=_worker, args=(store, db_path, games, seconds, increments, barrier, results))
+        for _ in range(workers)
+    ]
+    for p in procs:
+        p.start()
+    total = sum(results.get() for _ in procs)
+    for p in procs:
+        p.join()
+    lost = 0
+    if store == "sqlite":
+        with _counter_store(db_path).session("bench-counter") as counter:
+            lost = workers * increments - (counter["n"] if counter else 0)
+    return total / seconds, lost
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--games", type=int, default=8, help="concurrent games per worker")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--increments", type=int, default=200, help="counter updates per worker")
+    args = parser.parse_args()
+
+    print(f"{'store':<8} {'workers':>7} {'req/s':>10} {'lost updates':>13}")
+    rate, _ = run("memory", 1, args.games, args.seconds, 0)
+    print(f"{'memory':<8} {1:>7} {rate:>10.0f} {'-':>13}")
+    for n in args.workers:
+        rate, lost = run("sqlite", n, args.games, args.seconds, args.increments)
+        print(f"{'sqlite':<8} {n:>7} {rate:>10.0f} {lost:>13}")
+
+
+if __name__ == "__main__":
+    main()
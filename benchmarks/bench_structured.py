@@ -0,0 +1,99 @@
+"""Scene generation with and without the strict JSON schema.
+
+Offline it times parsing and validating a model response: the free-form
+path (`_extract_json_object` + `validate_and_normalize_scene`) vs the
+structured path (`json.loads` + `validate_structured_scene`).
+
+With --live N (needs OPENAI_API_KEY; honours OPENAI_BASE_URL) it runs N
+one-scene generations in each mode through the app's retrying generator
+and reports retry rate, wasted calls and p50/p95 generation latency.
+
+    python benchmarks/bench_structured.py --rounds 20000 --live 20
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["SCENE_CACHE_PATH"] = ""
+os.environ["SCENE_CORPUS_PATH"] = ""
+os.environ["BOSS_IMAGE_VARIANTS"] = "0"
+
+import app  # noqa: E402
+from scene_schema import (  # noqa: E402
+    GenerationStats,
+    validate_and_normalize_scene,
+    validate_structured_scene,
+)
+
+
+def _sample_output() -> str:
+    return json.dumps(
+        {
+            "scene": "The Carbon King looms over the school garden, belching smoke across the playground.",
+            "choices": [
+                {"id": cid, "text": f"Choice {cid} about saving energy at home", "is_sustainable": cid == "B",
+                 "delta_player": {"hp": 0 if cid == "B" else -4}, "delta_boss": {"hp": -11 if cid == "B" else -1}}
+                for cid in "ABCD"
+            ],
+        }
+    )
+
+
+def offline(rounds: int) -> None:
+    text = _sample_output()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        validate_and_normalize_scene(app._extract_json_object(text), 1)
+    freeform = (time.perf_counter() - start) / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        validate_structured_scene(json.loads(text), 1)
+    structured = (time.perf_counter() - start) / rounds
+
+    print("parse + validate one scene:")
+    print(f"  freeform:   {freeform * 1e6:7.2f} us")
+    print(f"  structured: {structured * 1e6:7.2f} us ({freeform / structured:.1f}x faster)")
+
+
+def live(generations: int) -> None:
+    boss_name, category = app._content().bosses[0]
+    boss = app.Boss(name=boss_name, category=category, hp=100)
+    player = app.Player(hp=100)
+    for structured in (False, True):
+        app.SCENE_STRUCTURED_OUTPUT = structured
+        app._generation_stats = GenerationStats()
+        state = {"session_id": "bench", "choice_history": deque(maxlen=60), "scene_history": deque(maxlen=30)}
+        for _ in range(generations):
+            app._generate_ai_scenes(boss, player, "medium", state, 1)
+        stats = app._generation_stats.snapshot()
+        print(
+            f"  {'structured' if structured else 'freeform':<10} "
+            f"{stats['scenes_generated']}/{generations} scenes, {stats['scene_model_calls']} calls, "
+            f"retry rate {stats['scene_retry_rate']:.2f}, wasted calls {stats['scene_wasted_calls']}, "
+            f"p50 {stats['scene_generation_p50_ms']:.0f} ms, p95 {stats['scene_generation_p95_ms']:.0f} ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20000)
+    parser.add_argument("--live", type=int, default=0, help="generations per mode against the API")
+    args = parser.parse_args()
+
+    offline(args.rounds)
+    if args.live:
+        if not app.client:
+            sys.exit("--live needs OPENAI_API_KEY")
+        print(f"live, {args.live} generations per mode:")
+        live(args.live)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Concurrent games against the local stub model server (stub_server.py).
+
+Starts the stub in-process with a latency/error profile, points the app at it
+through OPENAI_BASE_URL and plays G games at once through Flask's test
+client, each pausing --think seconds per turn like a reader would. Every
+scene goes through the real path: prefetch pool, LLM gateway, breaker,
+structured output, repair and the streamed-scene fallback on a miss.
+
+Reports turn latency, how many turns were served instantly from the
+prefetch queue vs streamed, and the app's and the stub's counters.
+
+    python benchmarks/bench_stub_load.py --profile typical --games 32 --seconds 30
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import threading
+import time
+from typing import List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from prefetch import percentile  # noqa: E402
+from stub_server import PROFILES, start_stub_server  # noqa: E402
+
+
+def _play(client, seconds: float, think: float, turns: List[float], streams: List[float], served: List[str]) -> None:
+    data = client.post("/api/start", json={"username": "bench", "difficulty": "medium"}).get_json()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        outcome = data.get("outcome")
+        if outcome in ("victory", "player_defeated"):
+            data = client.post("/api/start", json={"username": "bench", "difficulty": "medium"}).get_json()
+        elif outcome == "boss_defeated_choose_reward":
+            data = client.post("/api/claim_reward", json={"reward_id": data["rewards"][0]["id"]}).get_json()
+        else:
+            choice = (data.get("choices") or [{"id": "A"}])[0]["id"]
+            data = client.post("/api/apply_choice", json={"choice_id": choice}).get_json()
+        if data.get("scene_stream"):
+            response = client.get("/api/scene_stream")
+            for _ in response.response:
+                pass
+            response.close()
+            streams.append(time.perf_counter() - start)
+            served.append("streamed")
+        elif data.get("choices"):
+            served.append("instant")
+        turns.append(time.perf_counter() - start)
+        time.sleep(think)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="typical")
+    parser.add_argument("--games", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--think", type=float, default=1.0, help="seconds a player reads each scene")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    stub, base_url = start_stub_server(PROFILES[args.profile], seed=args.seed)
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ.pop("OPENAI_API_KEY", None)
+    os.environ["SCENE_CACHE_PATH"] = ""  # every scene has to come from the model
+    os.environ["SCENE_CORPUS_PATH"] = ""
+    os.environ["BOSS_IMAGE_VARIANTS"] = "0"
+    import app  # noqa: E402
+
+    turns: List[float] = []
+    streams: List[float] = []
+    served: List[str] = []
+    clients = [app.app.test_client() for _ in range(args.games)]
+    threads = [
+        threading.Thread(target=_play, args=(c, args.seconds, args.think, turns, streams, served))
+        for c in clients
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    status = clients[0].get("/api/prefetch_status").get_json()
+    print(f"{args.games} games, {args.seconds:.0f}s, profile {args.profile}, think {args.think}s")
+    print(f"  turns: {len(turns)}, p50 {percentile(turns, 0.5) * 1000:.0f} ms, p95 {percentile(turns, 0.95) * 1000:.0f} ms")
+    print(
+        f"  instant from prefetch/content: {served.count('instant')}/{len(served)}, "
+        f"streamed: {served.count('streamed')} (p95 {percentile(streams, 0.95) * 1000:.0f} ms)"
+    )
+    for key in (
+        "llm_submitted", "llm_failed", "llm_peak_in_flight", "llm_latency_p95_ms", "breaker_trips",
+        "scene_retry_rate", "scene_wasted_calls", "scene_repaired", "near_dup_rejected", "model_routes",
+    ):
+        if key in status:
+            print(f"  {key}: {status[key]}")
+    print(f"  stub: {stub.stub.snapshot()}")
+    stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Response bytes per full game, by Accept-Encoding.
+
+Plays whole games to victory through Flask's test client the way the page
+does (index, styles.css, script.js, /api/start, /api/apply_choice per
+turn, /api/claim_reward after each boss, /api/fact at the end) and adds up
+the response body bytes as sent, once per encoding the client offers.
+Scenes come from the built-in fallbacks (no model calls), and each
+encoding replays the same seeded games. Boss images are left out: they
+are already compressed.
+
+    python benchmarks/bench_wire_bytes.py --games 5
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import os
+import random
+import re
+import sys
+from typing import Dict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.pop("OPENAI_API_KEY", None)
+os.environ.pop("OPENAI_BASE_URL", None)
+os.environ["SCENE_CACHE_PATH"] = ""
+os.environ["SCENE_CORPUS_PATH"] = ""
+os.environ["BOSS_IMAGE_VARIANTS"] = "0"
+
+import app  # noqa: E402
+from compression import ENCODINGS, brotli  # noqa: E402
+
+
+def _decode(response) -> bytes:
+    body = response.data
+    encoding = response.headers.get("Content-Encoding")
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "br":
+        return brotli.decompress(body)
+    return body
+
+
+def _winning_choice(client) -> str:
+    """A sustainable choice of the current scene, so every game runs to victory."""
+    session_id = client.get_cookie(app.SESSION_COOKIE).value
+    with app._sessions.session(session_id) as state:
+        choices = state["current_scene_raw"]["choices"]
+    return next(c["id"] for c in choices if c["is_sustainable"])
+
+
+def play(accept_encoding: str, seed: int) -> Dict[str, int]:
+    random.seed(seed)
+    client = app.app.test_client()
+    headers = {"Accept-Encoding": accept_encoding}
+    totals = {"page": 0, "static": 0, "api": 0, "api_calls": 0}
+
+    page = client.get("/", headers=headers)
+    totals["page"] += len(page.data)
+    for url in re.findall(r'(?:href|src)="(/static/[^"]+)"', _decode(page).decode("utf-8")):
+        totals["static"] += len(client.get(url, headers=headers).data)
+
+    def api(method: str, url: str, **kwargs) -> Dict:
+        response = client.open(url, method=method, headers=headers, **kwargs)
+        totals["api"] += len(response.data)
+        totals["api_calls"] += 1
+        return json.loads(_decode(response))
+
+    data = api("POST", "/api/start", json={"username": "bench", "difficulty": "medium"})
+    while True:
+        outcome = data.get("outcome")
+        if outcome in ("victory", "player_defeated"):
+            api("GET", "/api/fact")
+            return totals
+        if outcome == "boss_defeated_choose_reward":
+            data = api("POST", "/api/claim_reward", json={"reward_id": data["rewards"][0]["id"]})
+        else:
+            data = api("POST", "/api/apply_choice", json={"choice_id": _winning_choice(client)})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=5)
+    args = parser.parse_args()
+
+    offers = [("identity", "identity"), ("gzip", "gzip")]
+    if "br" in ENCODINGS:
+        offers.append(("br", "br, gzip"))
+    print(f"per game, average of {args.games} (page and JSON compressed above {app.COMPRESS_MIN_BYTES} bytes):")
+    baseline = None
+    for label, accept in offers:
+        sums = {"page": 0, "static": 0, "api": 0, "api_calls": 0}
+        for seed in range(args.games):
+            for key, value in play(accept, seed).items():
+                sums[key] += value
+        per = {key: value / args.games for key, value in sums.items()}
+        total = per["page"] + per["static"] + per["api"]
+        baseline = baseline or total
+        print(
+            f"  {label:<9} {total / 1024:7.1f} KB total ({total / baseline:.0%}): "
+            f"page {per['page'] / 1024:5.1f} KB, static {per['static'] / 1024:5.1f} KB, "
+            f"API {per['api'] / 1024:6.1f} KB over {per['api_calls']:.0f} calls"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Pre-generate validated scenes for every boss into an offline scene corpus.
+
+Uses the app's own prompt and validation path, so point it at any
+OpenAI-compatible endpoint (OPENAI_BASE_URL) with OPENAI_API_KEY set:
+
+    python build_corpus.py --per-key 200 --out scene_corpus.bin
+
+The app memory-maps the result at startup (SCENE_CORPUS_PATH).
+"""
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import os
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+# The builder must not fill the live scene cache or map the corpus it is replacing
+os.environ["SCENE_CACHE_PATH"] = ""
+os.environ["SCENE_CORPUS_PATH"] = ""
+os.environ["BOSS_IMAGE_VARIANTS"] = "0"  # no image encoding alongside the build
+
+import app  # noqa: E402
+from scene_cache import SceneCache, scene_fingerprint  # noqa: E402
+from scene_corpus import SceneCorpus, write_corpus  # noqa: E402
+
+DIFFICULTIES = ("easy", "medium", "hard")
+
+
+def _build_key(
+    name: str, category: str, difficulty: str, per_key: int, batch: int, existing: List[Dict[str, Any]]
+) -> Tuple[str, List[Dict[str, Any]]]:
+    settings = app._difficulty_settings(difficulty)
+    boss = app.Boss(name=name, category=category, hp=settings["boss_hp"])
+    player = app.Player(hp=settings["player_hp"], max_hp=settings["player_hp"])
+    key = SceneCache.key(name, difficulty, settings["sustainable_choices"])
+    state = app._new_game_state(f"corpus:{key}")
+
+    scenes: List[Dict[str, Any]] = []
+    seen: set = set()
+    for scene in existing:
+        if scene_fingerprint(scene) not in seen:
+            seen.add(scene_fingerprint(scene))
+            scenes.append(scene)
+
+    dry_rounds = 0
+    while len(scenes) < per_key and dry_rounds < 5:
+        wanted = min(batch, per_key - len(scenes))
+        fresh = 0
+        for scene in app._generate_ai_scenes(boss, player, difficulty, state, wanted):
+            fingerprint = scene_fingerprint(scene)
+            if fingerprint in seen:
+                continue
+            seen.add(fingerprint)
+            scenes.append(scene)
+            fresh += 1
+        dry_rounds = 0 if fresh else dry_rounds + 1
+    return key, scenes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--per-key", type=int, default=200, help="scenes per boss and difficulty")
+    parser.add_argument("--batch", type=int, default=4, help="scenes requested per model call")
+    parser.add_argument("--parallel", type=int, default=16, help="bosses generated at once")
+    parser.add_argument("--difficulties", default=",".join(DIFFICULTIES))
+    parser.add_argument("--out", default="scene_corpus.bin")
+    parser.add_argument("--merge", action="store_true", help="keep the scenes already in --out")
+    args = parser.parse_args()
+
+    if not app.client:
+        sys.exit("Set OPENAI_API_KEY (and OPENAI_BASE_URL for a local stub) to build a corpus.")
+
+    existing: Dict[str, List[Dict[str, Any]]] = {}
+    if args.merge and os.path.exists(args.out):
+        corpus = SceneCorpus(args.out)
+        existing = {key: corpus.scenes(key) for key in corpus.keys()}
+        corpus.close()
+
+    jobs = [
+        (name, category, difficulty)
+        for difficulty in args.difficulties.split(",")
+        for name, category in app._content().bosses
+    ]
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(args.parallel) as pool:
+        futures = []
+        for name, category, difficulty in jobs:
+            sustainable = app._difficulty_settings(difficulty)["sustainable_choices"]
+            prior = existing.get(SceneCache.key(name, difficulty, sustainable), [])
+            futures.append(
+                pool.submit(_build_key, name, category, difficulty, args.per_key, args.batch, prior)
+            )
+        for future in concurrent.futures.as_completed(futures):
+            key, scenes = future.result()
+            groups[key] = scenes
+            print(f"{key}: {len(scenes)} scenes")
+
+    total = write_corpus(args.out, groups)
+    print(f"wrote {total} scenes to {args.out} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
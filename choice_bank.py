@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import random
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+
+class ChoiceBank:
+    """Immutable, precompiled form of a categorized choice bank.
+
+    Every choice gets an integer id. Categories are tuples of ids, and text
+    maps back to its id so a history of recent choice texts becomes a bitset
+    of ids. `sample()` picks `count` choices from different categories,
+    preferring ones not in the history, in O(count) expected time instead of
+    copying and shuffling the whole bank.
+    """
+
+    def __init__(self, bank: Mapping[str, Iterable[Mapping[str, Any]]], probes: int = 4) -> None:
+        names: List[str] = []
+        items: List[Tuple[str, int, int]] = []
+        categories: List[Tuple[int, ...]] = []
+        for name in bank:
+            ids = []
+            for item in bank[name]:
+                ids.append(len(items))
+                items.append(
+                    (item["text"], int(item["delta_player"]["hp"]), int(item["delta_boss"]["hp"]))
+                )
+            if ids:
+                names.append(name)
+                categories.append(tuple(ids))
+        self._setup(names, items, categories, probes)
+
+    def _setup(
+        self,
+        names: Iterable[str],
+        items: Iterable[Tuple[str, int, int]],
+        categories: Iterable[Iterable[int]],
+        probes: int,
+    ) -> None:
+        self.names: Tuple[str, ...] = tuple(names)
+        self._items: Tuple[Tuple[str, int, int], ...] = tuple(
+            (text, dp, db) for text, dp, db in items
+        )
+        self._categories: Tuple[Tuple[int, ...], ...] = tuple(tuple(ids) for ids in categories)
+        self._ids: Dict[str, int] = {text: i for i, (text, _, _) in enumerate(self._items)}
+        self._probes = probes
+
+    @classmethod
+    def from_compiled(cls, data: Mapping[str, Any], probes: int = 4) -> "ChoiceBank":
+        """Rebuild a bank from `to_compiled()` output without re-indexing it."""
+        bank = cls.__new__(cls)
+        bank._setup(data["names"], data["items"], data["categories"], probes)
+        return bank
+
+    def to_compiled(self) -> Dict[str, Any]:
+        """JSON-ready ids, items and category index arrays."""
+        return {
+            "names": list(self.names),
+            "items": [list(item) for item in self._items],
+            "categories": [list(ids) for ids in self._categories],
+        }
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def categories(self) -> Tuple[Tuple[int, ...], ...]:
+        """Choice ids grouped by category."""
+        return self._categories
+
+    def recent_mask(self, history: Iterable[str]) -> int:
+        """Bitset of the ids of bank choices whose text appears in `history`."""
+        mask = 0
+        ids = self._ids
+        for text in history:
+            i = ids.get(text)
+            if i is not None:
+                mask |= 1 << i
+        return mask
+
+    def choice(self, choice_id: int) -> Dict[str, Any]:
+        text, dp, db = self._items[choice_id]
+        return {"text": text, "delta_player": {"hp": dp}, "delta_boss": {"hp": db}}
+
+    def sample(
+        self, count: int, history: Iterable[str] = (), mask: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """`count` choices, one per category while categories last, avoiding
+        recently used ones where a few random probes can."""
+        if mask is None:
+            mask = self.recent_mask(history)
+        n = len(self._categories)
+        if not n:
+            return []
+        rand = random.random
+        cats: List[int] = []
+        while len(cats) < min(count, n):  # distinct categories, by rejection
+            cat = int(rand() * n)
+            if cat not in cats:
+                cats.append(cat)
+        while len(cats) < count:  # more choices than categories: reuse some
+            cats.append(int(rand() * n))
+
+        picked: List[int] = []
+        taken = 0
+        for cat in cats:
+            ids = self._categories[cat]
+            pick = -1
+            for _ in range(self._probes):
+                candidate = ids[int(rand() * len(ids))]
+                if taken >> candidate & 1:
+                    continue
+                pick = candidate
+                if not mask >> candidate & 1:
+                    break  # fresh
+            if pick < 0:
+                free = [i for i in ids if not taken >> i & 1]
+                if not free:
+                    free = [i for i in range(len(self._items)) if not taken >> i & 1]
+                    if not free:
+                        break
+                pick = random.choice(free)
+            taken |= 1 << pick
+            picked.append(pick)
+        return [self.choice(i) for i in picked]
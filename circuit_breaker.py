@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of making a call while the breaker is open."""
+
+
+class CircuitBreaker:
+    """Stops calling a degraded upstream so callers can fall back instantly.
+
+    closed:    calls go through. `failure_threshold` consecutive failures
+               (errors, timeouts, or calls slower than `slow_call_seconds`)
+               trip the breaker.
+    open:      calls are rejected for `reset_seconds`.
+    half_open: up to `half_open_probes` trial calls are let through; one
+               success closes the breaker, one failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        slow_call_seconds: float = 20.0,
+        reset_seconds: float = 30.0,
+        half_open_probes: int = 1,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.reset_seconds = reset_seconds
+        self.half_open_probes = half_open_probes
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._failures = 0
+        self._probes = 0
+        self.trips = 0
+        self.rejected = 0
+        self.slow_calls = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        # Called with the lock held; open turns half-open once the reset time passes
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+            self._state = self.HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go out now (a half-open probe counts as one)."""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and self._probes < self.half_open_probes:
+                self._probes += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def check(self) -> None:
+        if not self.allow():
+            raise CircuitOpenError("Model calls are paused after repeated failures.")
+
+    def record_success(self, elapsed: float) -> None:
+        if elapsed >= self.slow_call_seconds:
+            with self._lock:
+                self.slow_calls += 1
+            self.record_failure()
+            return
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probes = 0
+
+    def record_abandoned(self) -> None:
+        """A call was cancelled before it finished; free its half-open probe."""
+        with self._lock:
+            if self._current_state() == self.HALF_OPEN and self._probes:
+                self._probes -= 1
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            state = self._current_state()
+            if state == self.HALF_OPEN or (
+                state == self.CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self.trips += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "breaker_state": self._current_state(),
+                "breaker_consecutive_failures": self._failures,
+                "breaker_trips": self.trips,
+                "breaker_rejected": self.rejected,
+                "breaker_slow_calls": self.slow_calls,
+            }
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import gzip
+import os
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+# Content-Encodings the server can produce, preferred first
+ENCODINGS: Tuple[str, ...] = ("br", "gzip") if brotli is not None else ("gzip",)
+COMPRESSIBLE_EXTENSIONS = (".css", ".js", ".svg", ".html", ".json", ".txt")
+
+
+def compress(data: bytes, encoding: str, best: bool = False) -> bytes:
+    """`data` in `encoding`; `best` spends more CPU for files compressed once."""
+    if encoding == "br":
+        return brotli.compress(data, quality=11 if best else 5)
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=9 if best else 6, mtime=0)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def is_compressible(filename: str) -> bool:
+    return filename.lower().endswith(COMPRESSIBLE_EXTENSIONS)
+
+
+class PrecompressedAssets:
+    """Static text assets compressed once per content version, kept in memory.
+
+    Keyed by (filename, version, encoding), so an edited file is
+    compressed again under its new version. Files that would not shrink
+    are remembered as such and served as they are.
+    """
+
+    def __init__(self, root: str, min_bytes: int = 512) -> None:
+        self.root = os.path.abspath(root)
+        self.min_bytes = min_bytes
+        self._lock = threading.Lock()
+        self._bodies: Dict[Tuple[str, str, str], Optional[bytes]] = {}
+
+    def warm(self, files: Iterable[Tuple[str, str]]) -> int:
+        """Compress (filename, version) pairs up front in every encoding; returns how many files."""
+        count = 0
+        for filename, version in files:
+            if is_compressible(filename):
+                for encoding in ENCODINGS:
+                    self.get(filename, version, encoding)
+                count += 1
+        return count
+
+    def get(self, filename: str, version: str, encoding: str) -> Optional[bytes]:
+        """Compressed body, or None if the file should be served uncompressed."""
+        key = (filename, version, encoding)
+        with self._lock:
+            if key in self._bodies:
+                return self._bodies[key]
+        body = None
+        if is_compressible(filename):
+            try:
+                with open(os.path.join(self.root, filename), "rb") as f:
+                    data = f.read()
+            except OSError:
+                return None
+            if len(data) >= self.min_bytes:
+                packed = compress(data, encoding, best=True)
+                if len(packed) < len(data):
+                    body = packed
+        with self._lock:
+            self._bodies[key] = body
+        return body
+
+
+class CompressionStats:
+    """Responses compressed on the fly, and the bytes saved."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.responses = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def record(self, bytes_in: int, bytes_out: int) -> None:
+        with self._lock:
+            self.responses += 1
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "compressed_responses": self.responses,
+                "compressed_bytes_in": self.bytes_in,
+                "compressed_bytes_out": self.bytes_out,
+                "compression_ratio": round(self.bytes_out / self.bytes_in, 3) if self.bytes_in else 0.0,
+                "content_encodings": list(ENCODINGS),
+            }
@@ -0,0 +1,303 @@
+"""Compile the game's content pack (content/content.json) into its runtime artifact.
+
+    python content_pack.py [--source content/content.json] [--out content/content.pack]
+
+The server compiles the pack itself when the artifact is missing or older
+than the source, and hot-swaps it when either file changes, so this is only
+needed to check an edit or to ship a prebuilt artifact.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from choice_bank import ChoiceBank
+from scene_cache import scene_fingerprint
+from scene_schema import validate_and_normalize_scene
+from scene_sequencer import SceneSequencer
+
+_MAGIC = b"BRPACK1\n"
+FORMAT = 1
+
+CuratedIndex = Dict[Tuple[str, int], Tuple[Tuple[str, Dict[str, Any]], ...]]
+
+
+# === Compiling === #
+def _fail(where: str, message: str) -> ValueError:
+    return ValueError(f"content: {where}: {message}")
+
+
+def _check_choices(name: str, bank: Any, min_categories: int) -> Dict[str, List[Dict[str, Any]]]:
+    if not isinstance(bank, dict):
+        raise _fail(name, "must map category -> list of choices")
+    for category, items in bank.items():
+        if not isinstance(items, list):
+            raise _fail(f"{name}.{category}", "must be a list")
+        for i, item in enumerate(items):
+            try:
+                ok = bool(str(item["text"]).strip())
+                int(item["delta_player"]["hp"])
+                int(item["delta_boss"]["hp"])
+            except (KeyError, TypeError, ValueError):
+                ok = False
+            if not ok:
+                raise _fail(f"{name}.{category}[{i}]", "needs text, delta_player.hp and delta_boss.hp")
+    if sum(1 for items in bank.values() if items) < min_categories:
+        raise _fail(name, f"needs at least {min_categories} non-empty categories")
+    return bank
+
+
+def _curate_scene(name: str, raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Validated copy of a hand-written scene; raises ValueError naming `name`.
+
+    Every choice flags `is_sustainable` itself: whether an action is good for
+    the planet is content, not something its damage can tell. Only the HP
+    numbers are derived, as in generated scenes: sustainable choices cost
+    the player no HP.
+    """
+    choices = raw.get("choices")
+    if not isinstance(choices, list) or len(choices) != 4:
+        raise _fail(name, "needs exactly 4 choices")
+    for i, choice in enumerate(choices):
+        if not isinstance(choice, dict) or not isinstance(choice.get("is_sustainable"), bool):
+            raise _fail(f"{name}.choices[{i}]", "needs is_sustainable: true or false")
+    sustainable = sum(1 for c in choices if c["is_sustainable"])
+    if not sustainable:
+        raise _fail(name, "needs at least one sustainable choice")
+    payload = {
+        "scene": raw.get("scene", ""),
+        "choices": [
+            {**c, "id": chr(65 + i), "delta_player": {"hp": 0} if c["is_sustainable"] else c.get("delta_player")}
+            for i, c in enumerate(choices)
+        ],
+    }
+    try:
+        return validate_and_normalize_scene(payload, sustainable)
+    except ValueError as e:
+        raise _fail(name, str(e)) from None
+
+
+def compile_source(source: Mapping[str, Any]) -> Dict[str, Any]:
+    """Validate a content source and pre-index it (JSON-ready).
+
+    Raises ValueError naming the first bad entry.
+    """
+    bosses = source.get("bosses")
+    if not isinstance(bosses, list) or not bosses:
+        raise _fail("bosses", "must be a non-empty list")
+    names = set()
+    for i, boss in enumerate(bosses):
+        if not isinstance(boss, dict) or not str(boss.get("name", "")).strip() or not boss.get("category"):
+            raise _fail(f"bosses[{i}]", "needs name and category")
+        if boss["name"] in names:
+            raise _fail(f"bosses[{i}]", f"duplicate boss {boss['name']!r}")
+        names.add(boss["name"])
+
+    templates: List[str] = []
+    for style, items in (source.get("scene_templates") or {}).items():
+        for i, template in enumerate(items):
+            try:
+                template.format(boss="", category="")
+            except (AttributeError, IndexError, KeyError, ValueError):
+                raise _fail(f"scene_templates.{style}[{i}]", "may only use {boss} and {category}") from None
+            templates.append(template)
+    if not templates:
+        raise _fail("scene_templates", "needs at least one template")
+
+    # Fallback scenes take up to 2 sustainable and 3 unsustainable choices from distinct categories
+    sustainable = _check_choices("sustainable_choices", source.get("sustainable_choices"), 2)
+    unsustainable = _check_choices("unsustainable_choices", source.get("unsustainable_choices"), 3)
+
+    # A curated scene is served to games that need at most as many
+    # sustainable choices as it has
+    curated: Dict[str, List[List[Any]]] = {}
+    for boss_name, scenes in (source.get("battle_scenes") or {}).items():
+        compiled = [_curate_scene(f"battle_scenes.{boss_name}[{i}]", raw) for i, raw in enumerate(scenes)]
+        for sustainable_needed in (1, 2):
+            entries = [
+                [scene_fingerprint(scene), scene]
+                for scene in compiled
+                if sum(1 for c in scene["choices"] if c["is_sustainable"]) >= sustainable_needed
+            ]
+            if entries:
+                curated[f"{boss_name}|{sustainable_needed}"] = entries
+
+    facts = [str(fact) for fact in source.get("facts") or [] if str(fact).strip()]
+    if not facts:
+        raise _fail("facts", "needs at least one fact")
+
+    return {
+        "format": FORMAT,
+        "version": source.get("version", 0),
+        "bosses": [[boss["name"], boss["category"]] for boss in bosses],
+        "templates": templates,
+        "sustainable": ChoiceBank(sustainable).to_compiled(),
+        "unsustainable": ChoiceBank(unsustainable).to_compiled(),
+        "curated": curated,
+        "facts": facts,
+    }
+
+
+def write_pack(path: str, compiled: Mapping[str, Any]) -> None:
+    """Write the artifact atomically, so a running server never reads half a pack."""
+    data = _MAGIC + zlib.compress(json.dumps(compiled, separators=(",", ":")).encode("utf-8"), 9)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def read_pack(path: str) -> Dict[str, Any]:
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(_MAGIC):
+        raise ValueError(f"{path} is not a content pack.")
+    compiled = json.loads(zlib.decompress(data[len(_MAGIC):]))
+    if compiled.get("format") != FORMAT:
+        raise ValueError(f"{path} has pack format {compiled.get('format')}, expected {FORMAT}.")
+    return compiled
+
+
+# === Runtime === #
+class ContentPack:
+    """Immutable, ready-to-serve view of one compiled pack."""
+
+    def __init__(self, compiled: Mapping[str, Any]) -> None:
+        self.version = compiled["version"]
+        self.bosses: Tuple[Tuple[str, str], ...] = tuple((n, c) for n, c in compiled["bosses"])
+        self.facts: Tuple[str, ...] = tuple(compiled["facts"])
+        self.sustainable = ChoiceBank.from_compiled(compiled["sustainable"])
+        self.unsustainable = ChoiceBank.from_compiled(compiled["unsustainable"])
+        self.sequencer = SceneSequencer(compiled["templates"], self.sustainable, self.unsustainable)
+        self.curated: CuratedIndex = {}
+        for key, entries in compiled["curated"].items():
+            boss_name, _, sustainable_needed = key.rpartition("|")
+            self.curated[(boss_name, int(sustainable_needed))] = tuple(
+                (fingerprint, scene) for fingerprint, scene in entries
+            )
+
+    def curated_scenes(self, boss_name: str, sustainable_needed: int) -> Tuple[Tuple[str, Dict[str, Any]], ...]:
+        return self.curated.get((boss_name, sustainable_needed), ())
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class ContentStore:
+    """Loads the content pack on first use and hot-swaps it when it changes.
+
+    At most every `check_seconds` a request stats the source and artifact.
+    If either changed, a background thread compiles (when the source is
+    newer) and loads the new pack, then swaps the reference in one
+    assignment. Requests keep using the old pack meanwhile, and a bad edit
+    leaves the old pack in place with the error in `stats()`.
+    """
+
+    def __init__(self, source_path: str, pack_path: str, check_seconds: float = 5.0) -> None:
+        self.source_path = source_path
+        self.pack_path = pack_path
+        self.check_seconds = check_seconds
+        self.reloads = 0
+        self.last_error: Optional[str] = None
+        self._pack: Optional[ContentPack] = None
+        self._stamp: Tuple[Optional[int], Optional[int]] = (None, None)
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._reloading = False
+
+    def current(self) -> ContentPack:
+        pack = self._pack
+        if pack is None:
+            with self._lock:
+                if self._pack is None:
+                    self._swap(*self._build())
+                return self._pack
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_seconds:
+            self._checked_at = now
+            if self._current_stamp() != self._stamp and not self._reloading:
+                self._reloading = True
+                threading.Thread(target=self._reload_in_background, name="content-reload", daemon=True).start()
+        return pack
+
+    def reload(self) -> ContentPack:
+        """Rebuild and swap now (raises if the new content is invalid)."""
+        with self._lock:
+            self._swap(*self._build())
+            return self._pack
+
+    def _current_stamp(self) -> Tuple[Optional[int], Optional[int]]:
+        return _mtime(self.source_path), _mtime(self.pack_path)
+
+    def _build(self) -> Tuple[ContentPack, Tuple[Optional[int], Optional[int]]]:
+        source_mtime, pack_mtime = self._current_stamp()
+        if source_mtime is not None and (pack_mtime is None or source_mtime > pack_mtime):
+            with open(self.source_path, encoding="utf-8") as f:
+                compiled = compile_source(json.load(f))
+            try:
+                write_pack(self.pack_path, compiled)
+            except OSError:
+                pass  # read-only deploy: serve from memory
+            return ContentPack(compiled), self._current_stamp()
+        return ContentPack(read_pack(self.pack_path)), (source_mtime, pack_mtime)
+
+    def _swap(self, pack: ContentPack, stamp: Tuple[Optional[int], Optional[int]]) -> None:
+        if self._pack is not None:
+            self.reloads += 1
+        self._pack = pack
+        self._stamp = stamp
+        self.last_error = None
+
+    def _reload_in_background(self) -> None:
+        try:
+            with self._lock:
+                self._swap(*self._build())
+        except Exception as e:
+            self.last_error = str(e)
+            self._stamp = self._current_stamp()  # don't retry until the files change again
+        finally:
+            self._reloading = False
+
+    def stats(self) -> Dict[str, Any]:
+        pack = self._pack
+        return {
+            "content_version": pack.version if pack else None,
+            "content_reloads": self.reloads,
+            "content_error": self.last_error,
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", default=os.path.join("content", "content.json"))
+    parser.add_argument("--out", default=os.path.join("content", "content.pack"))
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with open(args.source, encoding="utf-8") as f:
+        try:
+            compiled = compile_source(json.load(f))
+        except ValueError as e:
+            sys.exit(str(e))
+    write_pack(args.out, compiled)
+    pack = ContentPack(read_pack(args.out))
+    print(
+        f"content v{pack.version}: {len(pack.bosses)} bosses, {len(compiled['templates'])} templates, "
+        f"{len(pack.sustainable)}+{len(pack.unsustainable)} choices, "
+        f"{sum(len(v) for v in pack.curated.values())} curated scenes, {len(pack.facts)} facts "
+        f"-> {args.out} ({os.path.getsize(args.out)} bytes, {time.perf_counter() - start:.3f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""Responsive variants of the boss portraits.
+
+Each image in static/boss_images/ is resized to a few widths and encoded as
+AVIF and WebP (whichever the installed Pillow supports), one worker process
+per image. Variant names carry a hash of the source bytes and the encoding
+settings, so an unchanged image is never re-encoded and a changed one gets
+new URLs. Builds take a file lock in the output directory, so only one
+process encodes at a time. Run it as a build step, or let the app build
+missing variants in the background at startup (skipped when the manifest
+is already current):
+
+    python image_pipeline.py
+
+Pillow is optional: without it nothing is built and the original images are
+served as before.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from PIL import Image, features
+except ImportError:  # optional dependency
+    Image = None
+    features = None
+
+try:
+    import fcntl
+except ImportError:  # not on Windows; builds are then not serialized
+    fcntl = None
+
+# The portrait is shown at 140px (110px on phones); 280 and 420 cover 2x and 3x screens
+WIDTHS = (140, 280, 420)
+QUALITY = {"avif": 50, "webp": 78}
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp"}
+SOURCE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+MANIFEST = "manifest.json"
+LOCK_FILE = ".build.lock"
+_VERSION = 1  # bump when the encoding changes in a way the settings below don't show
+
+
+def available_formats() -> Tuple[str, ...]:
+    """Output formats this Pillow can encode, best first."""
+    if Image is None:
+        return ()
+    return tuple(fmt for fmt in ("avif", "webp") if features.check(fmt))
+
+
+def _settings(formats: Tuple[str, ...]) -> str:
+    return json.dumps([_VERSION, WIDTHS, formats, QUALITY], sort_keys=True)
+
+
+def _content_hash(path: str, settings: str) -> str:
+    digest = hashlib.sha256(settings.encode("utf-8"))
+    with open(path, "rb") as f:
+        digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def _render(job: Tuple[str, str, str, Tuple[str, ...]]) -> Dict[str, Any]:
+    """Worker process: every width and format of one source image."""
+    path, digest, out_dir, formats = job
+    stem = os.path.splitext(os.path.basename(path))[0]
+    variants: List[Dict[str, Any]] = []
+    with Image.open(path) as source:
+        image = source.convert("RGBA" if source.mode in ("RGBA", "LA", "P") else "RGB")
+    for width in WIDTHS:
+        w = min(width, image.width)  # never upscale
+        if variants and w == variants[-1]["width"]:
+            break
+        resized = image.resize((w, max(1, round(image.height * w / image.width))), Image.LANCZOS)
+        for fmt in formats:
+            name = f"{stem}.{digest}.{w}w.{fmt}"
+            target = os.path.join(out_dir, name)
+            if not os.path.exists(target):
+                tmp = f"{target}.{os.getpid()}.tmp"
+                options = {"method": 6} if fmt == "webp" else {}
+                resized.save(tmp, fmt.upper(), quality=QUALITY[fmt], **options)
+                os.replace(tmp, target)
+            variants.append({"format": fmt, "width": w, "file": name, "bytes": os.path.getsize(target)})
+    return {
+        "stem": stem,
+        "hash": digest,
+        "source_bytes": os.path.getsize(path),
+        "width": image.width,
+        "height": image.height,
+        "variants": variants,
+    }
+
+
+def read_manifest(out_dir: str) -> Dict[str, Any]:
+    try:
+        with open(os.path.join(out_dir, MANIFEST), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {"images": {}}
+    return manifest if isinstance(manifest.get("images"), dict) else {"images": {}}
+
+
+def _write_manifest(out_dir: str, manifest: Dict[str, Any]) -> None:
+    path = os.path.join(out_dir, MANIFEST)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def build_variants(source_dir: str, out_dir: str, workers: Optional[int] = None) -> Dict[str, Any]:
+    """Encode the variants that are missing or out of date; returns the manifest.
+
+    Images whose hash matches the manifest and whose files exist are
+    skipped; the rest are encoded in parallel. Files no longer referenced
+    are deleted.
+    """
+    formats = available_formats()
+    if not formats:
+        return read_manifest(out_dir)
+    os.makedirs(out_dir, exist_ok=True)
+    with _build_lock(out_dir):
+        # Read under the lock: another process may have just finished a build
+        manifest = read_manifest(out_dir)
+        images, jobs = _plan(source_dir, out_dir, formats, manifest)
+        return _encode(out_dir, formats, images, jobs, workers)
+
+
+def variants_current(source_dir: str, out_dir: str) -> bool:
+    """Whether the manifest already covers every source image as it is now."""
+    formats = available_formats()
+    if not formats:
+        return True
+    manifest = read_manifest(out_dir)
+    if manifest.get("formats") != list(formats):
+        return False
+    images, jobs = _plan(source_dir, out_dir, formats, manifest)
+    return not jobs and len(images) == len(manifest["images"])
+
+
+@contextlib.contextmanager
+def _build_lock(out_dir: str) -> Iterator[None]:
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(out_dir, LOCK_FILE), "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _plan(
+    source_dir: str, out_dir: str, formats: Tuple[str, ...], manifest: Dict[str, Any]
+) -> Tuple[Dict[str, Any], List[Tuple[str, str, str, Tuple[str, ...]]]]:
+    """(manifest entries still valid, encoding jobs for the other images)."""
+    settings = _settings(formats)
+    cached = manifest["images"]
+    images: Dict[str, Any] = {}
+    jobs = []
+    stems = set()
+    for filename in sorted(os.listdir(source_dir)):
+        stem, ext = os.path.splitext(filename)
+        if ext.lower() not in SOURCE_EXTENSIONS or stem in stems:
+            continue
+        stems.add(stem)
+        path = os.path.join(source_dir, filename)
+        digest = _content_hash(path, settings)
+        entry = cached.get(stem)
+        if entry and entry.get("hash") == digest and all(
+            os.path.exists(os.path.join(out_dir, v["file"])) for v in entry["variants"]
+        ):
+            images[stem] = entry
+        else:
+            jobs.append((path, digest, out_dir, formats))
+    return images, jobs
+
+
+def _encode(
+    out_dir: str,
+    formats: Tuple[str, ...],
+    images: Dict[str, Any],
+    jobs: List[Tuple[str, str, str, Tuple[str, ...]]],
+    workers: Optional[int],
+) -> Dict[str, Any]:
+    if jobs:
+        # spawn, not fork: the app calls this from a thread of a threaded server
+        with ProcessPoolExecutor(
+            max_workers=min(len(jobs), workers or os.cpu_count() or 1),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            for entry in pool.map(_render, jobs):
+                images[entry["stem"]] = entry
+
+    manifest = {"version": _VERSION, "formats": list(formats), "images": images}
+    _write_manifest(out_dir, manifest)
+    keep = {MANIFEST, LOCK_FILE} | {v["file"] for entry in images.values() for v in entry["variants"]}
+    for name in os.listdir(out_dir):
+        if name not in keep and not name.endswith(".tmp"):
+            os.remove(os.path.join(out_dir, name))
+    return {**manifest, "encoded": len(jobs)}
+
+
+class BossImageVariants:
+    """The built variants, looked up by image file stem, as `srcset`s.
+
+    Starts from whatever manifest is on disk; `build_in_background()`
+    encodes anything missing with up to `workers` processes and swaps the
+    new manifest in when done.
+    """
+
+    def __init__(self, source_dir: str, out_dir: str, url_prefix: str, workers: Optional[int] = None) -> None:
+        self.source_dir = source_dir
+        self.out_dir = out_dir
+        self.url_prefix = url_prefix
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._images: Dict[str, Any] = read_manifest(out_dir)["images"]
+        self.build_seconds = 0.0
+        self.last_error: Optional[str] = None
+
+    def build(self) -> None:
+        """Run this module's CLI and load the manifest it writes, unless the
+        manifest on disk is already current (the usual case once one worker
+        process, or the deploy, has built it).
+
+        A separate interpreter, because the encoder pool spawns processes
+        that re-import the caller's __main__ (the server, here)."""
+        if not available_formats() or variants_current(self.source_dir, self.out_dir):
+            return
+        started = time.monotonic()
+        command = [sys.executable, os.path.abspath(__file__), "--source", self.source_dir, "--out", self.out_dir]
+        if self.workers:
+            command += ["--workers", str(self.workers)]
+        result = subprocess.run(command, capture_output=True, text=True)
+        with self._lock:
+            if result.returncode != 0:
+                lines = (result.stderr or result.stdout).strip().splitlines()
+                self.last_error = lines[-1] if lines else f"exit status {result.returncode}"
+                return
+            self._images = read_manifest(self.out_dir)["images"]
+            self.build_seconds = time.monotonic() - started
+            self.last_error = None
+
+    def build_in_background(self) -> threading.Thread:
+        thread = threading.Thread(target=self.build, name="boss-image-variants", daemon=True)
+        thread.start()
+        return thread
+
+    def srcset(self, stem: str) -> Dict[str, str]:
+        """MIME type -> `srcset` value for one image, best format first ({} if not built)."""
+        with self._lock:
+            entry = self._images.get(stem)
+        if not entry:
+            return {}
+        out: Dict[str, List[str]] = {}
+        for v in entry["variants"]:
+            out.setdefault(MIME_TYPES[v["format"]], []).append(f"{self.url_prefix}{v['file']} {v['width']}w")
+        return {mime: ", ".join(candidates) for mime, candidates in out.items()}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "boss_image_variants": len(self._images),
+                "boss_image_formats": available_formats(),
+                "boss_image_build_ms": round(self.build_seconds * 1000, 1),
+                "boss_image_error": self.last_error,
+            }
+
+
+def main() -> None:
+    root = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Build responsive variants of the boss portraits.")
+    parser.add_argument("--source", default=os.path.join(root, "static", "boss_images"))
+    parser.add_argument("--out", default=os.path.join(root, "static", "boss_images", "variants"))
+    parser.add_argument("--workers", type=int, default=None, help="encoder processes (default: all cores)")
+    args = parser.parse_args()
+
+    if not available_formats():
+        raise SystemExit("Pillow with WebP or AVIF support is needed: pip install Pillow")
+    started = time.perf_counter()
+    manifest = build_variants(args.source, args.out, args.workers)
+    print(f"{manifest['encoded']} of {len(manifest['images'])} images encoded in {time.perf_counter() - started:.1f}s")
+    for stem, entry in sorted(manifest["images"].items()):
+        sizes = ", ".join(f"{v['width']}w.{v['format']} {v['bytes'] / 1024:.0f} KB" for v in entry["variants"])
+        print(f"  {stem}: {entry['source_bytes'] / 1024:.0f} KB -> {sizes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextlib
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, Optional
+
+from circuit_breaker import CircuitBreaker
+from prefetch import percentile
+
+
+class LLMGateway:
+    """Runs model calls for every session on one asyncio event loop.
+
+    Calls go through an async client (`client_factory()` is called on the
+    loop thread, e.g. `AsyncOpenAI`), so hundreds of requests can wait on
+    the network without parking a thread each. A global semaphore caps how
+    many calls are in flight and a per-session semaphore stops one game
+    from hogging the provider. Interactive calls (a player is waiting on
+    them) skip the per-session limit so they never queue behind that
+    session's own prefetch work.
+
+    Flask handlers and generation-pool threads use the sync façade:
+    `submit()` returns a concurrent.futures.Future (the prefetch producer
+    chains its work onto it instead of waiting), `create()` blocks on it,
+    and `stream()` yields output text deltas as they arrive.
+
+    Token usage reported by the provider (`response.usage`) is summed per
+    call, including the prompt-cache hits, and shows up in `stats()`.
+
+    Every call reports to a CircuitBreaker. Errors, deadline misses and slow
+    calls trip it, and while it is open the façade raises CircuitOpenError
+    straight away instead of queueing more calls on a degraded provider.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], Any],
+        max_in_flight: int = 16,
+        max_per_session: int = 2,
+        breaker: Optional[CircuitBreaker] = None,
+        call_timeout: Optional[float] = None,
+    ) -> None:
+        self.max_in_flight = max_in_flight
+        self.max_per_session = max_per_session
+        self.breaker = breaker or CircuitBreaker()
+        self.call_timeout = call_timeout  # default deadline for create()/stream()
+        self._client_factory = client_factory
+        self._client: Any = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._start_lock = threading.Lock()
+        self._global: Optional[asyncio.Semaphore] = None
+        # session_id -> [semaphore, number of calls holding a reference]
+        self._session_limits: Dict[str, list] = {}
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._latencies: Deque[float] = deque(maxlen=2048)
+        self.usage_calls = 0
+        self.input_tokens = 0
+        self.cached_input_tokens = 0
+        self.output_tokens = 0
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is not None:
+            return self._loop
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+                threading.Thread(
+                    target=self._run_loop, args=(loop, ready), name="llm-gateway", daemon=True
+                ).start()
+                ready.wait()
+                self._loop = loop
+        return self._loop
+
+    def _run_loop(self, loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        self._client = self._client_factory()
+        self._global = asyncio.Semaphore(self.max_in_flight)
+        ready.set()
+        loop.run_forever()
+
+    @contextlib.asynccontextmanager
+    async def _slot(self, session_id: str, interactive: bool = False) -> AsyncIterator[None]:
+        # Runs on the loop thread only, so the bookkeeping below needs no locks
+        limit = self._session_limits.get(session_id)
+        if limit is None:
+            limit = self._session_limits[session_id] = [asyncio.Semaphore(self.max_per_session), 0]
+        limit[1] += 1
+        try:
+            async with (contextlib.nullcontext() if interactive else limit[0]):
+                async with self._global:
+                    self.in_flight += 1
+                    self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+                    start = time.perf_counter()
+                    try:
+                        yield
+                    except asyncio.CancelledError:
+                        # Abandoned by the caller; deadline misses are recorded there
+                        self.failed += 1
+                        self.breaker.record_abandoned()
+                        raise
+                    except BaseException:
+                        self.failed += 1
+                        self.breaker.record_failure()
+                        raise
+                    finally:
+                        self.in_flight -= 1
+                    elapsed = time.perf_counter() - start
+                    self.completed += 1
+                    self._latencies.append(elapsed)
+                    self.breaker.record_success(elapsed)
+        finally:
+            limit[1] -= 1
+            if not limit[1]:
+                del self._session_limits[session_id]
+
+    def _record_usage(self, usage: Any) -> None:
+        # Loop thread only, like the other counters
+        if usage is None:
+            return
+        self.usage_calls += 1
+        self.input_tokens += getattr(usage, "input_tokens", 0) or 0
+        self.output_tokens += getattr(usage, "output_tokens", 0) or 0
+        details = getattr(usage, "input_tokens_details", None)
+        self.cached_input_tokens += getattr(details, "cached_tokens", 0) or 0
+
+    async def _call(self, session_id: str, kwargs: Dict[str, Any], interactive: bool = False) -> Any:
+        async with self._slot(session_id, interactive):
+            response = await self._client.responses.create(**kwargs)
+        self._record_usage(getattr(response, "usage", None))
+        return response
+
+    async def _stream(self, session_id: str, kwargs: Dict[str, Any], out: queue.Queue) -> None:
+        async with self._slot(session_id, interactive=True):
+            events = await self._client.responses.create(stream=True, **kwargs)
+            async for event in events:
+                kind = getattr(event, "type", "")
+                if kind == "response.output_text.delta":
+                    out.put(event.delta)
+                elif kind == "response.completed":
+                    self._record_usage(getattr(event.response, "usage", None))
+
+    async def _deadline(self, call: Any, timeout: float) -> Any:
+        try:
+            return await asyncio.wait_for(call, timeout)
+        except asyncio.TimeoutError:
+            self.breaker.record_failure()
+            raise
+
+    def submit(
+        self, session_id: str, timeout: Optional[float] = None, interactive: bool = False, **kwargs: Any
+    ) -> concurrent.futures.Future:
+        """Queue a `responses.create(**kwargs)` call; safe from any thread.
+
+        If `timeout` passes first (queueing included) the call is cancelled,
+        the Future raises TimeoutError, and it counts as a breaker failure.
+        `interactive` calls skip the per-session limit. Raises
+        CircuitOpenError while the breaker is open."""
+        self.breaker.check()
+        loop = self._ensure_loop()
+        self.submitted += 1
+        call = self._call(session_id, kwargs, interactive)
+        if timeout is not None:
+            call = self._deadline(call, timeout)
+        return asyncio.run_coroutine_threadsafe(call, loop)
+
+    def create(
+        self, session_id: str, timeout: Optional[float] = None, interactive: bool = False, **kwargs: Any
+    ) -> Any:
+        """Blocking façade over `submit()`, with `timeout` defaulting to `call_timeout`."""
+        if timeout is None:
+            timeout = self.call_timeout
+        return self.submit(session_id, timeout, interactive, **kwargs).result()
+
+    def stream(self, session_id: str, timeout: Optional[float] = None, **kwargs: Any) -> Iterator[str]:
+        """Yield output text deltas of a streamed `responses.create(**kwargs)`.
+
+        Streams are interactive: a player is watching the text arrive.
+
+        `timeout` (default `call_timeout`) bounds the whole stream, as it
+        does a create() call: once it passes the call is cancelled, the
+        iterator raises TimeoutError and it counts as a breaker failure.
+        Closing the iterator early cancels the call.
+        """
+        self.breaker.check()
+        if timeout is None:
+            timeout = self.call_timeout
+        deadline = time.monotonic() + timeout
+        loop = self._ensure_loop()
+        self.submitted += 1
+        chunks: queue.Queue = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(self._stream(session_id, kwargs, chunks), loop)
+        future.add_done_callback(lambda _: chunks.put(None))
+        try:
+            while True:
+                try:
+                    chunk = chunks.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    self.breaker.record_failure()
+                    raise TimeoutError("Model stream timed out.") from None
+                if chunk is None:
+                    break
+                yield chunk
+            future.result()  # surface errors raised by the call
+        finally:
+            future.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = list(self._latencies)
+        return {
+            "llm_max_in_flight": self.max_in_flight,
+            "llm_in_flight": self.in_flight,
+            "llm_peak_in_flight": self.peak_in_flight,
+            "llm_submitted": self.submitted,
+            "llm_completed": self.completed,
+            "llm_failed": self.failed,
+            "llm_latency_p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+            "llm_latency_p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+            "llm_input_tokens": self.input_tokens,
+            "llm_cached_input_tokens": self.cached_input_tokens,
+            "llm_output_tokens": self.output_tokens,
+            "llm_input_tokens_per_call": round(self.input_tokens / self.usage_calls, 1) if self.usage_calls else 0.0,
+            "llm_output_tokens_per_call": round(self.output_tokens / self.usage_calls, 1) if self.usage_calls else 0.0,
+            **self.breaker.stats(),
+        }
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional
+
+from prefetch import percentile
+
+INTERACTIVE = "interactive"
+PREFETCH = "prefetch"
+
+
+@dataclass(frozen=True)
+class ModelTier:
+    """Model configuration for one urgency level of scene generation."""
+
+    name: str
+    model: str
+    reasoning_effort: Optional[str]  # None: the provider's default
+    budget_seconds: float  # all calls of one generation together
+
+    def request_options(self) -> Dict[str, Any]:
+        """`responses.create` arguments this tier sets."""
+        options: Dict[str, Any] = {"model": self.model}
+        if self.reasoning_effort:
+            options["reasoning"] = {"effort": self.reasoning_effort}
+        return options
+
+
+def tier_from_env(name: str, model: str, effort: Optional[str], budget_seconds: float) -> ModelTier:
+    """A tier with the given defaults; SCENE_MODEL_<NAME> and SCENE_EFFORT_<NAME>
+    override the model and reasoning effort (an empty effort means the
+    provider's default)."""
+    suffix = name.upper()
+    return ModelTier(
+        name=name,
+        model=os.getenv(f"SCENE_MODEL_{suffix}", "").strip() or model,
+        reasoning_effort=os.getenv(f"SCENE_EFFORT_{suffix}", effort or "").strip() or None,
+        budget_seconds=budget_seconds,
+    )
+
+
+class _TierStats:
+    def __init__(self, samples: int) -> None:
+        self.routed = 0
+        self.calls = 0
+        self.failed_calls = 0
+        self.scenes = 0
+        self.invalid_scenes = 0
+        self.latencies: Deque[float] = deque(maxlen=samples)
+
+
+class ModelRouter:
+    """Picks the model configuration for a scene request by urgency.
+
+    A player waiting on a miss is routed to the interactive tier (small,
+    fast, strict deadline); speculative prefetch to the prefetch tier,
+    which may be slower and richer. Per-tier latency and output quality
+    (invalid scenes per call) are recorded, so the two can be tuned from
+    the environment and compared in /api/prefetch_status.
+    """
+
+    def __init__(self, *tiers: ModelTier, samples: int = 1024) -> None:
+        self.tiers: Dict[str, ModelTier] = {tier.name: tier for tier in tiers}
+        self._lock = threading.Lock()
+        self._stats = {name: _TierStats(samples) for name in self.tiers}
+
+    def route(self, name: str) -> ModelTier:
+        tier = self.tiers.get(name)
+        if tier is None:
+            raise ValueError(f"Unknown model tier: {name}")
+        with self._lock:
+            self._stats[name].routed += 1
+        return tier
+
+    def record(self, name: str, seconds: float, scenes: int = 0, invalid: int = 0, failed: bool = False) -> None:
+        """One model call of `name` that took `seconds` and produced `scenes`
+        valid and `invalid` rejected scenes (`failed`: errored or timed out)."""
+        with self._lock:
+            stats = self._stats[name]
+            stats.calls += 1
+            stats.failed_calls += int(failed)
+            stats.scenes += scenes
+            stats.invalid_scenes += invalid
+            stats.latencies.append(seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        with self._lock:
+            for name, tier in self.tiers.items():
+                stats = self._stats[name]
+                latencies = list(stats.latencies)
+                out[name] = {
+                    "model": tier.model,
+                    "reasoning_effort": tier.reasoning_effort or "default",
+                    "budget_seconds": tier.budget_seconds,
+                    "routed": stats.routed,
+                    "calls": stats.calls,
+                    "failed_calls": stats.failed_calls,
+                    "scenes": stats.scenes,
+                    "invalid_scenes": stats.invalid_scenes,
+                    "latency_p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+                    "latency_p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+                }
+        return {"model_routes": out}
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import base64
+import functools
+import random
+import re
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from prefetch import percentile
+
+_MASK64 = (1 << 64) - 1
+NUM_PERM = 32
+ROWS_PER_BAND = 2  # 16 bands: pairs at Jaccard 0.5 share a band 99% of the time
+_SIG = struct.Struct(f"<{NUM_PERM}H")
+
+# Fixed seed: signatures must match across worker processes and restarts
+_rng = random.Random(0x5CE7E)
+_PERMS: Tuple[Tuple[int, int], ...] = tuple(
+    (_rng.getrandbits(64) | 1, _rng.getrandbits(64)) for _ in range(NUM_PERM)
+)
+
+SCENE_THRESHOLD = 0.5
+CHOICE_THRESHOLD = 0.6
+
+Signature = Tuple[int, ...]
+
+
+def _shingles(text: str, sizes: Tuple[int, ...]) -> Set[int]:
+    words = re.findall(r"[a-z0-9']+", text.lower())
+    out = set()
+    for k in sizes:
+        for i in range(max(1, len(words) - k + 1)):
+            out.add(zlib.crc32(" ".join(words[i : i + k]).encode("utf-8")))
+    return out
+
+
+@functools.lru_cache(maxsize=8192)
+def text_signature(text: str, choice: bool = False) -> Signature:
+    """MinHash of a text's word shingles (16-bit per permutation).
+
+    Scenes use word pairs; short choice texts use single words and pairs,
+    so "Recycle the cans" and "Recycle all the cans" still look alike.
+    """
+    hashes = _shingles(text, (1, 2) if choice else (2,))
+    return tuple(min((a * x + b) & _MASK64 for x in hashes) & 0xFFFF for a, b in _PERMS)
+
+
+def similarity(a: Signature, b: Signature) -> float:
+    """Estimated Jaccard similarity of the texts behind two signatures."""
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERM
+
+
+def _band_keys(sig: Signature) -> List[Tuple[int, ...]]:
+    return [(i,) + sig[i : i + ROWS_PER_BAND] for i in range(0, NUM_PERM, ROWS_PER_BAND)]
+
+
+class _SignatureSet:
+    """The last `capacity` signatures, LSH-banded so a lookup only compares
+    against the few that share a band."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._sigs: Dict[int, Signature] = {}
+        self._order: Deque[int] = deque()
+        self._buckets: Dict[Tuple[int, ...], Set[int]] = {}
+        self._next = 0
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __iter__(self):
+        return (self._sigs[i] for i in self._order)
+
+    def add(self, sig: Signature) -> None:
+        if len(self._order) >= self.capacity:
+            old = self._order.popleft()
+            for key in _band_keys(self._sigs.pop(old)):
+                bucket = self._buckets[key]
+                bucket.discard(old)
+                if not bucket:
+                    del self._buckets[key]
+        i = self._next
+        self._next += 1
+        self._sigs[i] = sig
+        self._order.append(i)
+        for key in _band_keys(sig):
+            self._buckets.setdefault(key, set()).add(i)
+
+    def best(self, sig: Signature) -> float:
+        """Highest estimated similarity to a stored signature (0.0 if none is close)."""
+        candidates: Set[int] = set()
+        for key in _band_keys(sig):
+            bucket = self._buckets.get(key)
+            if bucket:
+                candidates |= bucket
+        return max((similarity(sig, self._sigs[i]) for i in candidates), default=0.0)
+
+
+class NearDupIndex:
+    """Compact near-duplicate index of the scenes and choices a game has seen.
+
+    Exact fingerprints only catch verbatim repeats; this catches a scene
+    whose text, or at least two of whose choices, closely match something
+    already shown. Signatures are 64 bytes, and the index serializes to a
+    short string for session stores (`to_state()` / `from_state()`).
+    """
+
+    def __init__(self, scenes: int = 30, choices: int = 60) -> None:
+        self.scenes = _SignatureSet(scenes)
+        self.choices = _SignatureSet(choices)
+
+    def add_scene(self, scene: Dict[str, Any]) -> None:
+        self.scenes.add(text_signature(scene["scene"]))
+        for choice in scene["choices"]:
+            self.choices.add(text_signature(choice["text"], True))
+
+    def is_near_duplicate(self, scene: Dict[str, Any]) -> bool:
+        start = time.perf_counter()
+        try:
+            if self.scenes.best(text_signature(scene["scene"])) >= SCENE_THRESHOLD:
+                return True
+            repeats = sum(
+                1
+                for choice in scene["choices"]
+                if self.choices.best(text_signature(choice["text"], True)) >= CHOICE_THRESHOLD
+            )
+            return repeats >= 2
+        finally:
+            NEAR_DUP_STATS.lookups.append(time.perf_counter() - start)
+
+    def copy(self) -> "NearDupIndex":
+        return NearDupIndex.from_state(self.to_state())
+
+    def to_state(self) -> Dict[str, Any]:
+        def pack(sigs: _SignatureSet) -> str:
+            return base64.b64encode(b"".join(_SIG.pack(*sig) for sig in sigs)).decode("ascii")
+
+        return {
+            "scenes": pack(self.scenes),
+            "choices": pack(self.choices),
+            "capacity": [self.scenes.capacity, self.choices.capacity],
+        }
+
+    @classmethod
+    def from_state(cls, data: Optional[Dict[str, Any]]) -> "NearDupIndex":
+        if not data:
+            return cls()
+        index = cls(*data.get("capacity", (30, 60)))
+        for name in ("scenes", "choices"):
+            raw = base64.b64decode(data.get(name, ""))
+            target = getattr(index, name)
+            for sig in _SIG.iter_unpack(raw):
+                target.add(sig)
+        return index
+
+
+class NearDupStats:
+    """Scenes dropped or passed over as near-duplicates, and lookup times."""
+
+    def __init__(self, samples: int = 4096) -> None:
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.deprioritized = 0
+        self.lookups: Deque[float] = deque(maxlen=samples)
+
+    def count(self, rejected: int = 0, deprioritized: int = 0) -> None:
+        with self._lock:
+            self.rejected += rejected
+            self.deprioritized += deprioritized
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = list(self.lookups)
+        return {
+            "near_dup_rejected": self.rejected,
+            "near_dup_deprioritized": self.deprioritized,
+            "near_dup_lookup_p50_us": round(percentile(lookups, 0.50) * 1e6, 1),
+            "near_dup_lookup_p99_us": round(percentile(lookups, 0.99) * 1e6, 1),
+        }
+
+
+NEAR_DUP_STATS = NearDupStats()
+
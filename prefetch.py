@@ -0,0 +1,411 @@
+from __future__ import annotations
+
+import concurrent.futures
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+
+def percentile(samples: list, pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+class LockStats:
+    """Rolling samples of how long a lock was waited for and held (seconds).
+
+    Appends go to bounded deques, which are atomic in CPython, so recording a
+    sample never takes another lock.
+    """
+
+    def __init__(self, samples: int = 4096) -> None:
+        self.wait: Deque[float] = deque(maxlen=samples)
+        self.hold: Deque[float] = deque(maxlen=samples)
+
+    def snapshot(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for name, series in (("wait", self.wait), ("hold", self.hold)):
+            samples = list(series)
+            out[f"lock_{name}_ms"] = {
+                "p50": round(percentile(samples, 0.50) * 1000, 3),
+                "p99": round(percentile(samples, 0.99) * 1000, 3),
+                "max": round(max(samples, default=0.0) * 1000, 3),
+                "samples": len(samples),
+            }
+        return out
+
+
+class InstrumentedLock:
+    """A `threading.Lock` that records wait and hold times into `LockStats`.
+
+    It implements the private hooks `threading.Condition` looks for, so time
+    spent parked in `Condition.wait()` is not counted as holding the lock.
+    """
+
+    def __init__(self, stats: LockStats) -> None:
+        self._lock = threading.Lock()
+        self._stats = stats
+        self._acquired_at = 0.0
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        start = time.perf_counter()
+        got = self._lock.acquire(blocking, timeout)
+        if got:
+            self._acquired_at = time.perf_counter()
+            self._stats.wait.append(self._acquired_at - start)
+        return got
+
+    def release(self) -> None:
+        self._stats.hold.append(time.perf_counter() - self._acquired_at)
+        self._lock.release()
+
+    __enter__ = acquire
+
+    def __exit__(self, *exc: Any) -> None:
+        self.release()
+
+    def locked(self) -> bool:
+        return self._lock.locked()
+
+    # Hooks used by threading.Condition
+    def _release_save(self) -> None:
+        self.release()
+
+    def _acquire_restore(self, _state: Any) -> None:
+        self.acquire()
+
+    def _is_owned(self) -> bool:
+        return self._lock.locked()
+
+
+# Shared by every session's queue so /api/prefetch_status can report contention.
+PREFETCH_LOCK_STATS = LockStats()
+
+
+class SceneQueue:
+    """Bounded queue of prefetched scenes for one session.
+
+    Each queue has its own target depth. Every scene is tagged with the boss
+    it was made for and, optionally, an `epoch` naming the game (and boss)
+    it belongs to, so a queue left over in one worker process after another
+    started a new game can tell its scenes are stale. `listener` is called (outside the queue lock) whenever
+    a scene is taken or the queue is cleared, so the generation pool can
+    schedule a refill. Every change bumps `version`, and `wait_changed()`
+    lets a push channel park until the next one. `clear()` also bumps
+    `generation` and empties the producer's `context`, so work started for
+    the previous game or boss can tell it is stale.
+    """
+
+    def __init__(
+        self,
+        target: int,
+        stats: LockStats = PREFETCH_LOCK_STATS,
+        listener: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self.target = target
+        self.listener = listener
+        self.context: Dict[str, Any] = {}  # scratch space for the producer
+        self._lock = InstrumentedLock(stats)
+        self._changed = threading.Condition(self._lock)
+        self._items: Deque[Dict[str, Any]] = deque()
+        self._closed = False
+        self.version = 0
+        self.generation = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @staticmethod
+    def _matches(scene: Dict[str, Any], boss_index: int, epoch: Optional[str]) -> bool:
+        return scene.get("boss_index") == boss_index and (epoch is None or scene.get("epoch") == epoch)
+
+    def count(self, boss_index: int, epoch: Optional[str] = None) -> int:
+        """Scenes queued for `boss_index` (of `epoch`, if given)."""
+        with self._lock:
+            return sum(1 for scene in self._items if self._matches(scene, boss_index, epoch))
+
+    def scenes(self, boss_index: int, epoch: Optional[str] = None) -> List[Dict[str, Any]]:
+        """The scenes queued for `boss_index` (of `epoch`, if given), oldest
+        first (left in the queue)."""
+        with self._lock:
+            return [scene for scene in self._items if self._matches(scene, boss_index, epoch)]
+
+    def wait_changed(self, version: int, timeout: Optional[float] = None) -> int:
+        """Park (without holding the lock) until `version` is stale or `timeout`
+        passes; returns the current version."""
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+    def _bump(self) -> None:
+        # Called with the lock held
+        self.version += 1
+        self._changed.notify_all()
+
+    def put(self, boss_index: int, scene: Dict[str, Any], epoch: Optional[str] = None) -> None:
+        with self._lock:
+            if not self._closed:
+                tags: Dict[str, Any] = {"boss_index": boss_index}
+                if epoch is not None:
+                    tags["epoch"] = epoch
+                self._items.append({**tags, **scene})
+                self._bump()
+
+    def take(
+        self,
+        boss_index: int,
+        avoid: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        skip: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        epoch: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Remove and return the first scene made for `boss_index`, if any,
+        preferring the first one `avoid` does not reject. Scenes `skip`
+        rejects, and with `epoch` given every scene of another epoch, are
+        dropped from the queue. `avoid` and `skip` must be fast: they run
+        under the queue lock."""
+        with self._lock:
+            pick = None
+            dropped = 0
+            i = 0
+            while i < len(self._items):
+                scene = self._items[i]
+                if epoch is not None and scene.get("epoch") != epoch:
+                    del self._items[i]
+                    dropped += 1
+                    continue
+                if scene.get("boss_index") == boss_index:
+                    if skip is not None and skip(scene):
+                        del self._items[i]
+                        dropped += 1
+                        continue
+                    if avoid is None or not avoid(scene):
+                        pick = i
+                        break
+                    if pick is None:
+                        pick = i
+                i += 1
+            taken = None
+            if pick is not None:
+                taken = self._items[pick]
+                del self._items[pick]
+            elif not dropped:
+                return None
+            self._bump()
+        self._notify()
+        return taken
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.context = {}
+            self.generation += 1
+            self._bump()
+        self._notify()
+
+    def close(self) -> None:
+        """Drop queued scenes; the pool stops scheduling work for this queue."""
+        with self._lock:
+            self._closed = True
+            self._items.clear()
+            self._bump()
+        self._notify()
+
+    def _notify(self) -> None:
+        if self.listener is not None:
+            self.listener()
+
+
+# Generate `count` scenes for a session into its queue. Returns False when
+# the session no longer wants scenes (game over), which unregisters it; or
+# a Future of that result when the job finishes without holding the thread.
+GenerateFn = Callable[[str, SceneQueue, int], Union[bool, "concurrent.futures.Future[bool]"]]
+
+
+class GenerationPool:
+    """Fixed-size set of generation threads shared by every session.
+
+    Sessions register their SceneQueue with `wake()`. Idle workers park on a
+    condition variable; when woken they pick the registered queue that is
+    emptiest relative to its target (counting scenes already being
+    generated), breaking ties by whoever was served longest ago. However many
+    games are running, at most `max_jobs` jobs (default: `workers`) run at
+    once.
+
+    A job may return a Future instead of blocking on its model call; the
+    worker then moves on and the job counts as running until the Future
+    resolves. Work the job has left for when the call returns is handed
+    back with `call_soon()` and runs on a worker ahead of new jobs, so
+    `max_jobs` can exceed the number of threads.
+
+    A job asks for up to `batch_size` scenes (never more than the queue has
+    room for), and those scenes are reserved while the job runs so two
+    workers do not overfill the same queue.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        generate: GenerateFn,
+        batch_size: int = 1,
+        max_failures: int = 2,
+        max_jobs: Optional[int] = None,
+    ) -> None:
+        self.workers = workers
+        self.batch_size = max(1, batch_size)
+        self.max_failures = max_failures
+        self.max_jobs = max_jobs or workers
+        self._generate = generate
+        self._cond = threading.Condition()
+        self._queues: Dict[str, SceneQueue] = {}
+        self._in_flight: Dict[str, int] = {}  # scenes reserved by running jobs
+        self._failures: Dict[str, int] = {}
+        self._served_at: Dict[str, int] = {}
+        self._calls: Deque[Callable[[], Any]] = deque()
+        self._ticket = 0
+        self._busy = 0
+        self._jobs = 0
+        self._threads: List[threading.Thread] = []
+
+    def wake(self, session_id: str, queue: SceneQueue) -> None:
+        """Register (or re-register) a session's queue and wake a worker."""
+        if queue.listener is None:
+            queue.listener = self._poke
+        with self._cond:
+            self._queues[session_id] = queue
+            self._failures.pop(session_id, None)
+            self._served_at.setdefault(session_id, 0)
+            self._ensure_started()
+            self._cond.notify()
+
+    def forget(self, session_id: str) -> None:
+        with self._cond:
+            self._unregister(session_id)
+
+    def is_scheduled(self, session_id: str) -> bool:
+        with self._cond:
+            return session_id in self._queues
+
+    def call_soon(self, fn: Callable[[], Any]) -> None:
+        """Run `fn` on a worker thread, before any new job is started."""
+        with self._cond:
+            self._calls.append(fn)
+            self._ensure_started()
+            self._cond.notify()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "workers": self.workers,
+                "busy_workers": self._busy,
+                "running_jobs": self._jobs,
+                "max_jobs": self.max_jobs,
+                "scheduled_sessions": len(self._queues),
+            }
+
+    def _poke(self) -> None:
+        with self._cond:
+            self._cond.notify()
+
+    def _ensure_started(self) -> None:
+        # Called with self._cond held; threads start on first use, not at import
+        while len(self._threads) < self.workers:
+            t = threading.Thread(target=self._run, name=f"scene-gen-{len(self._threads)}", daemon=True)
+            self._threads.append(t)
+            t.start()
+
+    def _unregister(self, session_id: str) -> None:
+        self._queues.pop(session_id, None)
+        self._failures.pop(session_id, None)
+        self._served_at.pop(session_id, None)
+
+    def _pick(self) -> Optional[Tuple[str, int]]:
+        """Emptiest queue first (fill ratio incl. in-flight), then least recently served.
+        Returns the session and how many scenes its queue has room for.
+        """
+        if self._jobs >= self.max_jobs:
+            return None
+        best: Optional[Tuple[str, int]] = None
+        best_key: Optional[Tuple[float, int]] = None
+        for sid, queue in list(self._queues.items()):
+            if queue.closed:
+                self._unregister(sid)
+                continue
+            pending = len(queue) + self._in_flight.get(sid, 0)
+            if pending >= queue.target:
+                continue
+            key = (pending / max(1, queue.target), self._served_at.get(sid, 0))
+            if best_key is None or key < best_key:
+                best, best_key = (sid, queue.target - pending), key
+        return best
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                picked = None if self._calls else self._pick()
+                while picked is None and not self._calls:
+                    self._cond.wait()
+                    picked = self._pick()
+                self._busy += 1
+                if self._calls:
+                    call = self._calls.popleft()
+                else:
+                    sid, room = picked
+                    count = min(room, self.batch_size)
+                    queue = self._queues[sid]
+                    self._ticket += 1
+                    self._served_at[sid] = self._ticket
+                    self._in_flight[sid] = self._in_flight.get(sid, 0) + count
+                    self._jobs += 1
+                    call = None
+
+            if call is not None:
+                try:
+                    call()
+                except Exception:
+                    pass  # continuations resolve their job's Future themselves
+                with self._cond:
+                    self._busy -= 1
+                continue
+
+            try:
+                result = self._generate(sid, queue, count)
+            except Exception:
+                result = None
+            with self._cond:
+                self._busy -= 1
+            if isinstance(result, concurrent.futures.Future):
+                result.add_done_callback(
+                    lambda future, sid=sid, queue=queue, count=count: self._finish(sid, queue, count, future)
+                )
+            else:
+                self._finish(sid, queue, count, result)
+
+    def _finish(self, sid: str, queue: SceneQueue, count: int, result: Any) -> None:
+        """Release a job's reservation; `result` is its return value, its
+        Future, or None if it raised."""
+        if isinstance(result, concurrent.futures.Future):
+            result = None if result.cancelled() or result.exception() else result.result()
+        wanted, failed = (True, True) if result is None else (result, False)
+        with self._cond:
+            self._jobs -= 1
+            self._in_flight[sid] -= count
+            if not self._in_flight[sid]:
+                del self._in_flight[sid]
+            if failed:
+                # Stop on persistent failures; the next wake() retries
+                self._failures[sid] = self._failures.get(sid, 0) + 1
+                if self._failures[sid] >= self.max_failures:
+                    wanted = False
+            else:
+                self._failures.pop(sid, None)
+            if not wanted and self._queues.get(sid) is queue:
+                self._unregister(sid)
+            self._cond.notify()
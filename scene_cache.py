@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Collection, Dict, Optional, Tuple
+
+
+def scene_fingerprint(scene: Dict[str, Any]) -> str:
+    """Stable id for a scene, used for dedupe and per-session "seen" sets."""
+    return hashlib.sha1(scene["scene"].encode("utf-8")).hexdigest()[:16]
+
+
+class SceneCache:
+    """On-disk cache of validated AI scenes, shared by every game and worker.
+
+    Scenes are grouped by a key (boss, difficulty and sustainable-choice
+    count) so a cached scene always fits the game drawing it. Entries expire
+    `ttl_seconds` after they were generated, and once the cache holds more
+    than `max_entries` the least recently drawn ones are evicted.
+    """
+
+    def __init__(
+        self, path: str, max_entries: int = 5000, ttl_seconds: float = 30 * 86400
+    ) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._writes_since_trim = 0
+
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS scenes ("
+            " fingerprint TEXT PRIMARY KEY, key TEXT NOT NULL, data TEXT NOT NULL,"
+            " created_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS scenes_key_used ON scenes(key, last_used)")
+        conn.execute("CREATE INDEX IF NOT EXISTS scenes_used ON scenes(last_used)")
+        conn.commit()
+
+    @staticmethod
+    def key(boss_name: str, difficulty: str, sustainable_choices: int) -> str:
+        return f"{boss_name}|{difficulty}|{sustainable_choices}"
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def add(self, key: str, scene: Dict[str, Any]) -> None:
+        """Store a scene that already passed validation (duplicates are ignored)."""
+        now = time.time()
+        data = json.dumps(
+            {"scene": scene["scene"], "choices": scene["choices"]}, separators=(",", ":")
+        )
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR IGNORE INTO scenes (fingerprint, key, data, created_at, last_used)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (scene_fingerprint(scene), key, data, now, now),
+        )
+        conn.commit()
+        self._writes_since_trim += 1
+        if self._writes_since_trim >= 50:
+            self._writes_since_trim = 0
+            self.trim()
+
+    def draw(
+        self, key: str, exclude: Collection[str] = ()
+    ) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Least recently drawn, unexpired scene for `key` not in `exclude`."""
+        conn = self._conn()
+        rows = conn.execute(
+            "SELECT fingerprint, data FROM scenes WHERE key = ? AND created_at > ?"
+            " ORDER BY last_used LIMIT ?",
+            (key, time.time() - self.ttl_seconds, len(exclude) + 1),
+        ).fetchall()
+        for fingerprint, data in rows:
+            if fingerprint in exclude:
+                continue
+            conn.execute(
+                "UPDATE scenes SET last_used = ? WHERE fingerprint = ?", (time.time(), fingerprint)
+            )
+            conn.commit()
+            self.hits += 1
+            return fingerprint, json.loads(data)
+        self.misses += 1
+        return None
+
+    def trim(self) -> None:
+        """Apply the TTL, then evict least recently used entries over the cap."""
+        conn = self._conn()
+        conn.execute("DELETE FROM scenes WHERE created_at <= ?", (time.time() - self.ttl_seconds,))
+        conn.execute(
+            "DELETE FROM scenes WHERE fingerprint IN ("
+            " SELECT fingerprint FROM scenes ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        conn.commit()
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM scenes").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "scene_cache_entries": len(self),
+            "scene_cache_hits": self.hits,
+            "scene_cache_misses": self.misses,
+        }
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import random
+import struct
+from typing import Any, Collection, Dict, List, Optional, Tuple
+
+from scene_cache import scene_fingerprint
+
+# File layout (all integers little-endian):
+#
+#   record 0 \n record 1 \n ...     one compact JSON scene per line
+#   offsets                         (records + 1) x u64, byte offset of each record
+#   header                          JSON {"keys": {key: [first_record, count]}}
+#   trailer                         u64 offsets_pos, u32 header_len, 4-byte magic
+#
+# Records are grouped by key, so a key is a contiguous range of records and
+# sampling one is a random index plus two offset reads.
+_MAGIC = b"BRC1"
+_TRAILER = struct.Struct("<QI4s")
+_OFFSET = struct.Struct("<Q")
+
+
+def write_corpus(path: str, groups: Dict[str, List[Dict[str, Any]]]) -> int:
+    """Write scenes grouped by cache key to `path` (atomically); returns the record count."""
+    tmp_path = f"{path}.tmp"
+    offsets: List[int] = []
+    keys: Dict[str, List[int]] = {}
+    with open(tmp_path, "wb") as f:
+        for key in sorted(groups):
+            keys[key] = [len(offsets), len(groups[key])]
+            for scene in groups[key]:
+                offsets.append(f.tell())
+                record = {"scene": scene["scene"], "choices": scene["choices"]}
+                f.write(json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n")
+        offsets.append(f.tell())
+        offsets_pos = f.tell()
+        f.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+        header = json.dumps({"keys": keys}, separators=(",", ":")).encode("utf-8")
+        f.write(header)
+        f.write(_TRAILER.pack(offsets_pos, len(header), _MAGIC))
+    os.replace(tmp_path, path)
+    return len(offsets) - 1
+
+
+class SceneCorpus:
+    """Read-only, memory-mapped corpus of pre-generated scenes (see build_corpus.py).
+
+    Only the per-key header is parsed at open; records and offsets stay in
+    the page cache, so resident memory barely grows with corpus size and
+    every worker process shares the same pages.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) < _TRAILER.size:
+            raise ValueError(f"{path} is not a scene corpus.")
+        offsets_pos, header_len, magic = _TRAILER.unpack_from(self._mm, len(self._mm) - _TRAILER.size)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a scene corpus.")
+        header_pos = len(self._mm) - _TRAILER.size - header_len
+        header = json.loads(self._mm[header_pos:header_pos + header_len])
+        self._offsets_pos = offsets_pos
+        self._keys: Dict[str, Tuple[int, int]] = {k: (v[0], v[1]) for k, v in header["keys"].items()}
+        self._records = (header_pos - offsets_pos) // _OFFSET.size - 1
+
+    def __len__(self) -> int:
+        return self._records
+
+    def keys(self) -> List[str]:
+        return list(self._keys)
+
+    def count(self, key: str) -> int:
+        return self._keys.get(key, (0, 0))[1]
+
+    def scene(self, index: int) -> Dict[str, Any]:
+        pos = self._offsets_pos + index * _OFFSET.size
+        start, end = struct.unpack_from("<QQ", self._mm, pos)
+        return json.loads(self._mm[start:end])
+
+    def scenes(self, key: str) -> List[Dict[str, Any]]:
+        first, count = self._keys.get(key, (0, 0))
+        return [self.scene(i) for i in range(first, first + count)]
+
+    def sample(
+        self, key: str, exclude: Collection[str] = (), tries: int = 8
+    ) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """A random scene for `key` whose fingerprint is not in `exclude`."""
+        first, count = self._keys.get(key, (0, 0))
+        for _ in range(min(count, tries)):
+            scene = self.scene(first + random.randrange(count))
+            fingerprint = scene_fingerprint(scene)
+            if fingerprint not in exclude:
+                self.hits += 1
+                return fingerprint, scene
+        self.misses += 1
+        return None
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "scene_corpus_entries": self._records,
+            "scene_corpus_hits": self.hits,
+            "scene_corpus_misses": self.misses,
+        }
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import random
+import threading
+from typing import Any, Dict, List
+
+from choice_bank import ChoiceBank
+from scene_schema import validate_and_normalize_scene
+
+# Rules in the order they are tried; the counters in stats() use these names
+RULES = (
+    "drop_blank_choices",
+    "drop_duplicate_choices",
+    "infer_sustainable_flag",
+    "trim_choices",
+    "pad_choices",
+    "swap_bank_choice",
+    "relabel_ids",
+)
+
+
+def _looks_sustainable(choice: Dict[str, Any]) -> bool:
+    """Guess a missing flag from the deltas: no self-damage and a real hit on the boss."""
+    try:
+        dp = int((choice.get("delta_player") or {}).get("hp", 0))
+        db = int((choice.get("delta_boss") or {}).get("hp", 0))
+    except (AttributeError, TypeError, ValueError):
+        return False
+    return dp == 0 and db <= -5
+
+
+def _boss_damage(choice: Dict[str, Any]) -> int:
+    try:
+        return -int((choice.get("delta_boss") or {}).get("hp", 0))
+    except (AttributeError, TypeError, ValueError):
+        return 0
+
+
+class SceneRepairer:
+    """Turns near-valid model scenes into valid ones instead of re-asking.
+
+    A scene is kept if its text is there and at most `max_bank_choices` of
+    its four choices have to come from the content pack's choice banks;
+    otherwise it is unrepairable and the caller retries as before. Every
+    rule that fires is counted, so `stats()` shows which mistakes the model
+    actually makes.
+    """
+
+    def __init__(self, max_bank_choices: int = 2) -> None:
+        self.max_bank_choices = max_bank_choices
+        self._lock = threading.Lock()
+        self.repaired = 0
+        self.unrepairable = 0
+        self.rule_counts: Dict[str, int] = {rule: 0 for rule in RULES}
+
+    def repair(
+        self,
+        payload: Any,
+        sustainable_needed: int,
+        sustainable: ChoiceBank,
+        unsustainable: ChoiceBank,
+    ) -> Dict[str, Any]:
+        """Validated, normalized scene built from `payload`; raises ValueError if it cannot be saved."""
+        applied: List[str] = []
+        try:
+            scene = self._repair(payload, sustainable_needed, sustainable, unsustainable, applied)
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            with self._lock:
+                self.unrepairable += 1
+            raise ValueError(f"Unrepairable scene: {e}") from e
+        with self._lock:
+            self.repaired += 1
+            for rule in applied:
+                self.rule_counts[rule] += 1
+        return scene
+
+    def _repair(
+        self,
+        payload: Any,
+        sustainable_needed: int,
+        sustainable: ChoiceBank,
+        unsustainable: ChoiceBank,
+        applied: List[str],
+    ) -> Dict[str, Any]:
+        def fired(rule: str) -> None:
+            if rule not in applied:
+                applied.append(rule)
+
+        scene = str(payload.get("scene", "")).strip()
+        if not scene:
+            raise ValueError("no scene text")
+
+        raw_choices = payload.get("choices")
+        choices: List[Dict[str, Any]] = []
+        texts: set = set()
+        ids_ok = True
+        for raw in raw_choices if isinstance(raw_choices, list) else []:
+            text = str(raw.get("text", "")).strip() if isinstance(raw, dict) else ""
+            if not text:
+                fired("drop_blank_choices")
+                continue
+            if text in texts:
+                fired("drop_duplicate_choices")
+                continue
+            texts.add(text)
+            flag = raw.get("is_sustainable")
+            if not isinstance(flag, bool):
+                fired("infer_sustainable_flag")
+                flag = _looks_sustainable(raw)
+            choices.append({**raw, "text": text, "is_sustainable": flag})
+            ids_ok = ids_ok and str(raw.get("id", "")).strip().upper() == chr(64 + len(choices))
+
+        if len(choices) > 4:
+            # Keep the first choices of each kind the scene needs, topped up
+            # in order if the model wrote too few of one kind
+            fired("trim_choices")
+            quota = {True: sustainable_needed, False: 4 - sustainable_needed}
+            kept = []
+            for choice in choices:
+                if quota[choice["is_sustainable"]] > 0:
+                    quota[choice["is_sustainable"]] -= 1
+                    kept.append(choice)
+            for choice in choices:
+                if len(kept) < 4 and not any(choice is k for k in kept):
+                    kept.append(choice)
+            choices = [c for c in choices if any(c is k for k in kept)]
+
+        from_bank = 0
+
+        def bank_choice(is_sustainable: bool) -> Dict[str, Any]:
+            nonlocal from_bank
+            from_bank += 1
+            if from_bank > self.max_bank_choices:
+                raise ValueError("too many choices would come from the bank")
+            bank = sustainable if is_sustainable else unsustainable
+            picked = bank.sample(1, texts)
+            if not picked:
+                raise ValueError("choice bank is empty")
+            texts.add(picked[0]["text"])
+            return {**picked[0], "is_sustainable": is_sustainable}
+
+        count = sum(1 for c in choices if c["is_sustainable"])
+        while len(choices) < 4:
+            fired("pad_choices")
+            choices.insert(random.randrange(len(choices) + 1), bank_choice(count < sustainable_needed))
+            count = sum(1 for c in choices if c["is_sustainable"])
+
+        # Wrong sustainable count: replace the choice that fits its label worst
+        while count != sustainable_needed:
+            fired("swap_bank_choice")
+            too_many = count > sustainable_needed
+            candidates = [i for i, c in enumerate(choices) if c["is_sustainable"] == too_many]
+            if too_many:
+                worst = min(candidates, key=lambda i: _boss_damage(choices[i]))
+            else:
+                worst = max(candidates, key=lambda i: _boss_damage(choices[i]))
+            choices[worst] = bank_choice(not too_many)
+            count += -1 if too_many else 1
+
+        if not ids_ok or applied:
+            if not ids_ok:
+                fired("relabel_ids")
+            for i, choice in enumerate(choices):
+                choice["id"] = chr(65 + i)
+        return validate_and_normalize_scene({"scene": scene, "choices": choices}, sustainable_needed)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "scene_repaired": self.repaired,
+                "scene_unrepairable": self.unrepairable,
+                "scene_repair_rules": dict(self.rule_counts),
+            }
+
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List
+
+from prefetch import percentile
+
+# Allowed HP change per choice; out-of-range model values are clamped
+PLAYER_HP_DELTA = (-10, 0)
+BOSS_HP_DELTA = (-20, 5)
+
+
+def clamp_int(value: Any, min_value: int, max_value: int) -> int:
+    try:
+        n = int(value)
+    except Exception:
+        n = 0
+    return max(min_value, min(max_value, n))
+
+
+def validate_and_normalize_scene(
+    payload: Dict[str, Any], sustainable_needed: int
+) -> Dict[str, Any]:
+    scene = str(payload.get("scene", "")).strip()
+    choices = payload.get("choices", [])
+    if not scene or not isinstance(choices, list) or len(choices) != 4:
+        raise ValueError("Invalid scene payload.")
+
+    normalized: List[Dict[str, Any]] = []
+    seen_ids: set[str] = set()
+    for choice in choices:
+        cid = str(choice.get("id", "")).strip().upper()
+        if cid not in {"A", "B", "C", "D"} or cid in seen_ids:
+            raise ValueError("Choices must have unique ids A-D.")
+        seen_ids.add(cid)
+
+        text = str(choice.get("text", "")).strip()
+        if not text:
+            raise ValueError("Choice text is required.")
+
+        is_sustainable = bool(choice.get("is_sustainable", False))
+        delta_player = choice.get("delta_player", {}) or {}
+        delta_boss = choice.get("delta_boss", {}) or {}
+
+        dp = clamp_int(delta_player.get("hp", 0), *PLAYER_HP_DELTA)
+        db = clamp_int(delta_boss.get("hp", 0), *BOSS_HP_DELTA)
+
+        normalized.append(
+            {
+                "id": cid,
+                "text": text,
+                "is_sustainable": is_sustainable,
+                "delta_player": {"hp": dp},
+                "delta_boss": {"hp": db},
+            }
+        )
+
+    sustainable_count = sum(1 for c in normalized if c["is_sustainable"])
+    if sustainable_count != sustainable_needed:
+        raise ValueError("Wrong number of sustainable choices.")
+
+    return {"scene": scene, "choices": normalized}
+
+
+# === Structured output === #
+def _hp_schema(bounds: tuple) -> Dict[str, Any]:
+    return {
+        "type": "object",
+        "properties": {"hp": {"type": "integer", "minimum": bounds[0], "maximum": bounds[1]}},
+        "required": ["hp"],
+        "additionalProperties": False,
+    }
+
+
+# The scene shape as a strict JSON schema, "scene" first so streamed text
+# can be shown before the choices arrive. It cannot express "exactly N
+# sustainable choices" or distinct ids; validate_structured_scene checks those.
+SCENE_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "scene": {"type": "string"},
+        "choices": {
+            "type": "array",
+            "minItems": 4,
+            "maxItems": 4,
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string", "enum": ["A", "B", "C", "D"]},
+                    "text": {"type": "string"},
+                    "is_sustainable": {"type": "boolean"},
+                    "delta_player": _hp_schema(PLAYER_HP_DELTA),
+                    "delta_boss": _hp_schema(BOSS_HP_DELTA),
+                },
+                "required": ["id", "text", "is_sustainable", "delta_player", "delta_boss"],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["scene", "choices"],
+    "additionalProperties": False,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def scene_response_format(count: int = 1) -> Dict[str, Any]:
+    """`text=` argument of `responses.create` constraining output to `count` scenes."""
+    if count <= 1:
+        name, schema = "scene", SCENE_SCHEMA
+    else:
+        name = f"scenes_{count}"
+        schema = {
+            "type": "object",
+            "properties": {
+                "scenes": {"type": "array", "minItems": count, "maxItems": count, "items": SCENE_SCHEMA}
+            },
+            "required": ["scenes"],
+            "additionalProperties": False,
+        }
+    return {"format": {"type": "json_schema", "name": name, "schema": schema, "strict": True}}
+
+
+def _structured_hp(delta: Dict[str, Any], bounds: tuple) -> int:
+    """The integer `hp` of a delta, clamped to `bounds` like the loose path."""
+    hp = delta["hp"]
+    if type(hp) is not int:
+        raise ValueError("HP deltas must be integers.")
+    return clamp_int(hp, *bounds)
+
+
+def validate_structured_scene(payload: Dict[str, Any], sustainable_needed: int) -> Dict[str, Any]:
+    """Single-pass check of a scene generated under SCENE_SCHEMA.
+
+    Checks what the schema cannot (non-blank text, distinct ids, the
+    sustainable count) plus the HP types and ranges, which a model that
+    ignored the schema may get wrong, and returns the same shape as
+    validate_and_normalize_scene. Raises ValueError on a bad payload.
+    """
+    try:
+        scene = payload["scene"].strip()
+        choices = payload["choices"]
+        if not scene or len(choices) != 4:
+            raise ValueError("Invalid scene payload.")
+        seen = 0
+        sustainable = 0
+        normalized = []
+        for choice in choices:
+            cid = choice["id"]
+            bit = 1 << (ord(cid) - 65)
+            text = choice["text"].strip()
+            if seen & bit or not text:
+                raise ValueError("Choices need distinct ids and text.")
+            seen |= bit
+            is_sustainable = choice["is_sustainable"] is True
+            sustainable += is_sustainable
+            normalized.append(
+                {
+                    "id": cid,
+                    "text": text,
+                    "is_sustainable": is_sustainable,
+                    "delta_player": {"hp": _structured_hp(choice["delta_player"], PLAYER_HP_DELTA)},
+                    "delta_boss": {"hp": _structured_hp(choice["delta_boss"], BOSS_HP_DELTA)},
+                }
+            )
+    except (AttributeError, KeyError, TypeError) as e:
+        raise ValueError("Scene does not match the schema.") from e
+    if seen != 0b1111 or sustainable != sustainable_needed:
+        raise ValueError("Wrong ids or number of sustainable choices.")
+    return {"scene": scene, "choices": normalized}
+
+
+class GenerationStats:
+    """How scene generations fared: model calls, retries and latency.
+
+    A generation is one request for scenes, retries included. A model call
+    is wasted when it yields no usable scene (error, timeout, bad JSON or
+    every scene invalid), which is what costs a retry round-trip.
+    """
+
+    def __init__(self, samples: int = 2048) -> None:
+        self._lock = threading.Lock()
+        self.generations = 0
+        self.calls = 0
+        self.wasted_calls = 0
+        self.invalid_scenes = 0
+        self.scenes = 0
+        self.latencies: Deque[float] = deque(maxlen=samples)
+
+    def record(self, calls: int, wasted_calls: int, scenes: int, invalid_scenes: int, started: float) -> None:
+        """Record a finished generation that began at `started` (time.monotonic())."""
+        elapsed = time.monotonic() - started
+        with self._lock:
+            self.generations += 1
+            self.calls += calls
+            self.wasted_calls += wasted_calls
+            self.scenes += scenes
+            self.invalid_scenes += invalid_scenes
+        self.latencies.append(elapsed)
+
+    def snapshot(self) -> Dict[str, Any]:
+        latencies = list(self.latencies)
+        with self._lock:
+            generations, calls, wasted = self.generations, self.calls, self.wasted_calls
+            scenes, invalid = self.scenes, self.invalid_scenes
+        return {
+            "scene_generations": generations,
+            "scene_model_calls": calls,
+            "scene_retry_rate": round((calls - generations) / generations, 3) if generations else 0.0,
+            "scene_wasted_calls": wasted,
+            "scene_wasted_call_rate": round(wasted / calls, 3) if calls else 0.0,
+            "scene_invalid_scenes": invalid,
+            "scenes_generated": scenes,
+            "scene_generation_p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+            "scene_generation_p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+        }
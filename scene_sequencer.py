@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import functools
+import math
+from typing import Any, Dict, List, Sequence, Tuple
+
+from choice_bank import ChoiceBank
+
+_MASK64 = (1 << 64) - 1
+
+
+def _mix(*parts: int) -> int:
+    """splitmix64 over the parts: a cheap, deterministic 64-bit hash."""
+    x = 0
+    for part in parts:
+        x = (x + (part & _MASK64) + 0x9E3779B97F4A7C15) & _MASK64
+        x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+        x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+        x ^= x >> 31
+    return x
+
+
+@functools.lru_cache(maxsize=None)
+def _units(n: int) -> Tuple[int, ...]:
+    """Multipliers a for which i -> a*i + b (mod n) is a permutation of range(n)."""
+    return tuple(a for a in range(1, n) if math.gcd(a, n) == 1) or (1,)
+
+
+@functools.lru_cache(maxsize=4096)
+def _affine(n: int, key: Tuple[int, ...]) -> Tuple[int, int]:
+    h = _mix(*key)
+    units = _units(n)
+    return units[h % len(units)], (h >> 32) % n
+
+
+def _permute(i: int, n: int, *key: int) -> int:
+    """Position i of a pseudo-random permutation of range(n) chosen by `key`."""
+    a, b = _affine(n, key)
+    return (a * i + b) % n
+
+
+class SceneSequencer:
+    """Deterministic, non-repeating fallback scenes for one game.
+
+    A game is just `(seed, index)`: scene `index` is computed directly from
+    affine permutations keyed by the seed, so drawing is O(1) and a session
+    stores two integers however long it runs. Within a scene the choices come
+    from different categories. A template is not reused until every template
+    has been shown, and a choice is not reused until its category has
+    offered every item in it (for the built-in banks: 12 scenes for the
+    unsustainable choices of medium and hard games). After that, fresh
+    permutations take over.
+    """
+
+    def __init__(
+        self, templates: Sequence[str], sustainable: ChoiceBank, unsustainable: ChoiceBank
+    ) -> None:
+        self.templates = tuple(templates)
+        self.sustainable = sustainable
+        self.unsustainable = unsustainable
+
+    def _template(self, seed: int, index: int) -> str:
+        n = len(self.templates)
+        return self.templates[_permute(index % n, n, seed, 0, index // n)]
+
+    @staticmethod
+    def _choices(bank: ChoiceBank, count: int, seed: int, salt: int, index: int) -> List[Dict[str, Any]]:
+        categories = bank.categories
+        n = len(categories)
+        if not count or not n:
+            return []
+        if count > n:
+            raise ValueError("More choices per scene than categories in the bank.")
+        # Each category epoch hands every scene `count` distinct categories
+        per_epoch = n // count
+        epoch, slot = divmod(index, per_epoch)
+        picked = []
+        for j in range(count):
+            cat = _permute(slot * count + j, n, seed, salt, epoch)
+            ids = categories[cat]
+            # The category's epoch-th use takes the next item of its own permutation
+            round_, pos = divmod(epoch, len(ids))
+            picked.append(bank.choice(ids[_permute(pos, len(ids), seed, salt + 1 + cat, round_)]))
+        return picked
+
+    def draw(
+        self, seed: int, index: int, sustainable_needed: int
+    ) -> Tuple[str, List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """(template, sustainable choices, unsustainable choices) for scene `index`."""
+        return (
+            self._template(seed, index),
+            self._choices(self.sustainable, sustainable_needed, seed, 1_000, index),
+            self._choices(self.unsustainable, 4 - sustainable_needed, seed, 2_000, index),
+        )
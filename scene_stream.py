@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class SceneTextParser:
+    """Incremental JSON scanner that pulls one top-level string field out of a
+    model response while it streams in.
+
+    `feed()` takes raw chunks (split anywhere, even inside an escape) and
+    returns the newly decoded characters of the field, so the scene text can
+    be shown before the rest of the object (the choices) has arrived. Text
+    before the opening brace, such as a code fence, is skipped. The full raw
+    text is kept in `text` for normal parsing and validation at the end.
+    """
+
+    def __init__(self, field: str = "scene") -> None:
+        self.field = field
+        self.done = False
+        self._raw: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._unicode: Optional[str] = None
+        self._expect_key = False
+        self._is_key = False
+        self._key: List[str] = []
+        self._last_key: Optional[str] = None
+        self._capturing = False
+
+    @property
+    def text(self) -> str:
+        return "".join(self._raw)
+
+    def feed(self, chunk: str) -> str:
+        self._raw.append(chunk)
+        out: List[str] = []
+        for ch in chunk:
+            if self._in_string:
+                self._string_char(ch, out)
+            elif ch == '"' and self._depth >= 1:
+                self._in_string = True
+                self._is_key = self._depth == 1 and self._expect_key
+                self._key = []
+                self._capturing = (
+                    not self._is_key
+                    and not self.done
+                    and self._depth == 1
+                    and self._last_key == self.field
+                )
+            elif ch in "{[":
+                self._depth += 1
+                if ch == "{" and self._depth == 1:
+                    self._expect_key = True
+            elif ch in "}]":
+                self._depth = max(0, self._depth - 1)
+            elif self._depth == 1 and ch == ",":
+                self._expect_key = True
+                self._last_key = None
+            elif self._depth == 1 and ch == ":":
+                self._expect_key = False
+        return "".join(out)
+
+    def _string_char(self, ch: str, out: List[str]) -> None:
+        if self._unicode is not None:
+            self._unicode += ch
+            if len(self._unicode) == 4:
+                try:
+                    self._emit(chr(int(self._unicode, 16)), out)
+                except ValueError:
+                    pass
+                self._unicode = None
+        elif self._escape:
+            self._escape = False
+            if ch == "u":
+                self._unicode = ""
+            else:
+                self._emit(_ESCAPES.get(ch, ch), out)
+        elif ch == "\\":
+            self._escape = True
+        elif ch == '"':
+            self._in_string = False
+            if self._is_key:
+                self._last_key = "".join(self._key)
+            elif self._capturing:
+                self._capturing = False
+                self.done = True
+        else:
+            self._emit(ch, out)
+
+    def _emit(self, ch: str, out: List[str]) -> None:
+        if self._is_key:
+            self._key.append(ch)
+        elif self._capturing:
+            out.append(ch)
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import errno
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import IO, Any, Callable, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # not POSIX: one worker process only
+    fcntl = None
+
+StateFactory = Callable[[], Dict[str, Any]]
+
+
+class SessionStore:
+    """Where game state lives between requests.
+
+    `session(sid, factory)` yields the state dict for `sid` and keeps that
+    session locked until the block exits; any changes made to the dict are
+    kept. Backends that live outside the process let several gunicorn
+    workers serve the same game.
+    """
+
+    def session(
+        self, sid: Optional[str], factory: Optional[StateFactory] = None
+    ) -> ContextManager[Optional[Dict[str, Any]]]:
+        raise NotImplementedError
+
+    def delete(self, sid: str) -> None:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+def _stripe_index(sid: str, stripes: int) -> int:
+    return zlib.crc32(sid.encode("utf-8")) % stripes
+
+
+class _Entry:
+    """One player's game state plus the lock that serializes their requests."""
+
+    __slots__ = ("lock", "state", "last_seen")
+
+    def __init__(self, state: Dict[str, Any]) -> None:
+        self.lock = threading.Lock()
+        self.state = state
+        self.last_seen = time.monotonic()
+
+
+class MemorySessionStore(SessionStore):
+    """Thread-safe, session-keyed game state held in this process.
+
+    Lookups are a plain dict read (O(1), no lock). Creating a session only
+    takes one of a small set of striped locks, and each request then holds
+    just its own session's lock, so concurrent players never contend on a
+    single global lock.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 6 * 3600,
+        stripes: int = 64,
+        on_evict: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.on_evict = on_evict
+        self._entries: Dict[str, _Entry] = {}
+        self._stripes: List[threading.Lock] = [threading.Lock() for _ in range(stripes)]
+        self._last_sweep = time.monotonic()
+
+    def _stripe(self, sid: str) -> threading.Lock:
+        return self._stripes[_stripe_index(sid, len(self._stripes))]
+
+    def _get_or_create(
+        self, sid: str, factory: Optional[StateFactory]
+    ) -> Optional[_Entry]:
+        entry = self._entries.get(sid)
+        if entry is not None or factory is None:
+            return entry
+        with self._stripe(sid):
+            entry = self._entries.get(sid)
+            if entry is None:
+                entry = _Entry(factory())
+                self._entries[sid] = entry
+            return entry
+
+    @contextmanager
+    def session(
+        self, sid: Optional[str], factory: Optional[StateFactory] = None
+    ) -> Iterator[Optional[Dict[str, Any]]]:
+        """Yield the state dict for `sid` while holding its lock.
+
+        Yields None when the session does not exist and no `factory` is given.
+        """
+        self._maybe_sweep()
+        entry = self._get_or_create(sid, factory) if sid else None
+        if entry is None:
+            yield None
+            return
+        with entry.lock:
+            entry.last_seen = time.monotonic()
+            yield entry.state
+
+    def delete(self, sid: str) -> None:
+        if self._entries.pop(sid, None) is not None and self.on_evict:
+            self.on_evict(sid)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _maybe_sweep(self) -> None:
+        """Drop sessions idle for longer than the TTL (at most once a minute)."""
+        now = time.monotonic()
+        if now - self._last_sweep < 60:
+            return
+        self._last_sweep = now
+        for sid, entry in list(self._entries.items()):
+            if now - entry.last_seen > self.ttl_seconds and not entry.lock.locked():
+                self.delete(sid)
+
+
+# Stripe locks and lock file per database path, shared by every store on
+# that file in this process: POSIX record locks belong to the process, so
+# its threads have to be serialized before the file lock is taken.
+_db_locks: Dict[str, Tuple[List[threading.Lock], Optional[IO[bytes]]]] = {}
+_db_locks_guard = threading.Lock()
+
+
+def _db_stripes(path: str, stripes: int) -> Tuple[List[threading.Lock], Optional[IO[bytes]]]:
+    key = os.path.abspath(path)
+    with _db_locks_guard:
+        if key not in _db_locks:
+            lock_file = open(key + ".lock", "a+b") if fcntl is not None else None
+            _db_locks[key] = ([threading.Lock() for _ in range(stripes)], lock_file)
+        return _db_locks[key]
+
+
+class SqliteSessionStore(SessionStore):
+    """Game state serialized into a local SQLite database in WAL mode.
+
+    Every gunicorn worker opens the same file, so any worker can serve any
+    request. A session's read-modify-write runs under its stripe lock: a
+    thread lock within the process plus a byte-range lock on `<path>.lock`
+    across processes, so two workers serving one game cannot lose each
+    other's updates. This is a lock per stripe rather than `BEGIN IMMEDIATE`,
+    which would lock every session in the database for as long as one
+    request runs (including a model call on a scene miss). State is written
+    back only if its encoded form changed.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        encode: Callable[[Dict[str, Any]], bytes],
+        decode: Callable[[bytes], Dict[str, Any]],
+        ttl_seconds: float = 6 * 3600,
+        stripes: int = 64,
+        on_evict: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        self.path = path
+        self.encode = encode
+        self.decode = decode
+        self.ttl_seconds = ttl_seconds
+        self.on_evict = on_evict
+        self._local = threading.local()
+        self._stripes, self._lock_file = _db_stripes(path, stripes)
+        self._last_sweep = time.monotonic()
+
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " sid TEXT PRIMARY KEY, data BLOB NOT NULL, updated_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS sessions_updated ON sessions(updated_at)")
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread; sqlite3 connections are not thread-safe."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _locked(self, sid: str) -> Iterator[None]:
+        """Hold `sid`'s stripe in this process and, via the lock file, in all others."""
+        stripe = _stripe_index(sid, len(self._stripes))
+        with self._stripes[stripe]:
+            if self._lock_file is None:
+                yield
+                return
+            while True:
+                try:
+                    fcntl.lockf(self._lock_file, fcntl.LOCK_EX, 1, stripe)
+                    break
+                except OSError as exc:
+                    # The kernel sees record locks as held by the process, so two
+                    # processes whose threads wait on each other's stripes look
+                    # like a deadlock; the holders are other threads, so wait.
+                    if exc.errno != errno.EDEADLK:
+                        raise
+                    time.sleep(0.001)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._lock_file, fcntl.LOCK_UN, 1, stripe)
+
+    @contextmanager
+    def session(
+        self, sid: Optional[str], factory: Optional[StateFactory] = None
+    ) -> Iterator[Optional[Dict[str, Any]]]:
+        self._maybe_sweep()
+        if not sid:
+            yield None
+            return
+        with self._locked(sid):
+            conn = self._conn()
+            row = conn.execute("SELECT data FROM sessions WHERE sid = ?", (sid,)).fetchone()
+            if row is not None:
+                blob: Optional[bytes] = row[0]
+                state = self.decode(blob)
+            elif factory is not None:
+                blob = None
+                state = factory()
+            else:
+                yield None
+                return
+
+            yield state
+
+            new_blob = self.encode(state)
+            if new_blob != blob:
+                conn.execute(
+                    "INSERT INTO sessions (sid, data, updated_at) VALUES (?, ?, ?)"
+                    " ON CONFLICT(sid) DO UPDATE SET data = excluded.data,"
+                    " updated_at = excluded.updated_at",
+                    (sid, new_blob, time.time()),
+                )
+                conn.commit()
+
+    def delete(self, sid: str) -> None:
+        with self._locked(sid):
+            conn = self._conn()
+            conn.execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+            conn.commit()
+        if self.on_evict:
+            self.on_evict(sid)
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def _maybe_sweep(self) -> None:
+        """Drop sessions idle for longer than the TTL (at most once a minute)."""
+        now = time.monotonic()
+        if now - self._last_sweep < 60:
+            return
+        self._last_sweep = now
+        cutoff = time.time() - self.ttl_seconds
+        expired = self._conn().execute(
+            "SELECT sid FROM sessions WHERE updated_at < ?", (cutoff,)
+        ).fetchall()
+        for (sid,) in expired:
+            self.delete(sid)
@@ -15,6 +15,7 @@ const bossCategory = document.getElementById("boss_category");
 const bossHpText = document.getElementById("boss_hp");
 const bossHpBar = document.getElementById("boss_hp_bar");
 const bossImage = document.getElementById("boss_image");
+const bossImageSources = document.querySelectorAll("#boss_image_avif, #boss_image_webp");
 
 const playerHpText = document.getElementById("player_hp");
 const playerHpBar = document.getElementById("player_hp_bar");
@@ -53,7 +54,7 @@ let maxBossHp = 1;
 let inFlight = false;
 let currentBossName = null;
 let typewriterTimeout = null;
-let prefetchInterval = null;  // Background prefetch polling
+let prefetchEvents = null;  // Background prefetch long-poll (AbortController)
 
 // Story segments for the loading screen
 const STORY_SEGMENTS = [
@@ -128,8 +129,8 @@ async function runStorySequence() {
   for (const segment of STORY_SEGMENTS) {
     loadingStatus.textContent = segment.status;
     loadingBarFill.style.width = segment.progress + "%";
-    // Trigger prefetch during each segment to fill the scene queue
-    triggerPrefetch();
+    // Keep the scene queue filling while the story plays
+    if (!prefetchEvents) startPrefetchEvents();
     await typeWriter(storyText, segment.text, 25);
     await new Promise(r => setTimeout(r, 800));
   }
@@ -483,6 +484,7 @@ function showRewardModal(data) {
   
   rewardModal.classList.remove("hidden");
   rewardOptions.innerHTML = "";
+  preloadBossImages(data.preload_boss_images);
   
   if (rewardMessage) {
     rewardMessage.textContent = data.message || "Choose your reward!";
@@ -586,32 +588,40 @@ function setItemsDisabled(disabled) {
 }
 
 /**
- * Trigger background prefetch so scenes generate while user reads.
- * Called once when a scene starts rendering, then periodically.
+ * Long-poll the session's prefetch status so scenes generate while the user reads.
+ * Each request returns once the queue changes (or after 25 seconds) and
+ * the next one asks from the returned version; polling stops once the queue
+ * is full and restarts when the next scene starts rendering.
  */
-function triggerPrefetch() {
-  fetch("/api/trigger_prefetch", { method: "POST" })
-    .then(r => r.json())
-    .then(data => {
-      // Stop polling if queue is already full
-      if (data.queue_size >= data.target) {
-        stopPrefetchPolling();
-      }
-    })
-    .catch(() => {});
-}
-
-function startPrefetchPolling() {
-  stopPrefetchPolling();
-  // Trigger immediately, then every 4 seconds while user reads
-  triggerPrefetch();
-  prefetchInterval = setInterval(triggerPrefetch, 4000);
+function startPrefetchEvents() {
+  stopPrefetchEvents();
+  const controller = new AbortController();
+  prefetchEvents = controller;
+  pollPrefetchEvents(controller);
+}
+
+async function pollPrefetchEvents(controller) {
+  let since = -1;
+  while (prefetchEvents === controller) {
+    let data;
+    try {
+      const res = await fetch(`/api/events?since=${since}`, { signal: controller.signal });
+      data = await res.json();
+    } catch (err) {
+      if (controller.signal.aborted) return;
+      await new Promise(r => setTimeout(r, 3000));
+      continue;
+    }
+    if (data.status !== "ok" || data.queue_full) break;
+    since = data.version;
+  }
+  if (prefetchEvents === controller) prefetchEvents = null;
 }
 
-function stopPrefetchPolling() {
-  if (prefetchInterval) {
-    clearInterval(prefetchInterval);
-    prefetchInterval = null;
+function stopPrefetchEvents() {
+  if (prefetchEvents) {
+    prefetchEvents.abort();
+    prefetchEvents = null;
   }
 }
 
@@ -630,7 +640,7 @@ async function typewriterScene(element, text, speed = 40) {
     choicesEl.style.display = "none";
 
     // Start prefetching while user reads the typewriter text
-    startPrefetchPolling();
+    startPrefetchEvents();
     
     function type() {
       if (i < text.length) {
@@ -651,6 +661,92 @@ async function typewriterScene(element, text, speed = 40) {
   });
 }
 
+/**
+ * Stream a scene the server is still generating (prefetch miss).
+ * Text deltas arrive over SSE and are typed as they come in; the validated
+ * choices arrive in the final "scene" event.
+ */
+function streamScene(element, speed = 40) {
+  return new Promise((resolve) => {
+    const textNode = document.createTextNode("");
+    const cursor = document.createElement("span");
+    cursor.className = "scene-cursor";
+    element.innerHTML = "";
+    element.appendChild(textNode);
+    element.appendChild(cursor);
+    choicesEl.innerHTML = "";
+    choicesEl.style.display = "none";
+
+    startPrefetchEvents();
+
+    let target = "";
+    let shown = 0;
+    let finished = false;
+    const source = new EventSource("/api/scene_stream");
+
+    function type() {
+      typewriterTimeout = null;
+      if (shown < target.length) {
+        shown++;
+        textNode.textContent = target.substring(0, shown);
+        typewriterTimeout = setTimeout(type, speed);
+      } else if (finished) {
+        setTimeout(() => {
+          cursor.remove();
+          choicesEl.style.display = "";
+          setDisabledChoices(false);
+          resolve();
+        }, 300);
+      }
+    }
+
+    function pump() {
+      if (!typewriterTimeout) type();
+    }
+
+    source.addEventListener("text", (e) => {
+      target += JSON.parse(e.data).delta ?? "";
+      pump();
+    });
+
+    source.addEventListener("scene", (e) => {
+      source.close();
+      const data = JSON.parse(e.data);
+      // The validated text can differ from what streamed (e.g. a fallback scene)
+      if (!(data.scene ?? "").startsWith(target.substring(0, shown))) shown = 0;
+      target = data.scene ?? "";
+      setChoices(data.choices ?? []);
+      finished = true;
+      pump();
+    });
+
+    source.onerror = () => {
+      source.close();
+      if (finished) return;
+      // Stream broke: fetch the scene as plain JSON instead
+      fetch("/api/scene", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: "{}",
+      })
+        .then((r) => r.json())
+        .then((data) => {
+          if (data.scene_stream || !data.choices) throw new Error("Scene unavailable.");
+          target = data.scene ?? "";
+          shown = 0;
+          setChoices(data.choices);
+          finished = true;
+          pump();
+        })
+        .catch(() => {
+          cursor.remove();
+          if (turnFeedback) turnFeedback.textContent = "Something went wrong. Try again.";
+          resolve();
+        });
+    };
+  });
+}
+
 function renderGame(data) {
   showGameScreen();
   setStatus("");
@@ -662,12 +758,57 @@ function renderGameAfterLoading(data) {
   renderGameData(data);
 }
 
+// Resized AVIF/WebP variants when the server has them; the original otherwise
+function setBossImage(src, srcset) {
+  bossImageSources.forEach((source) => {
+    const candidates = srcset?.[source.type];
+    if (candidates) source.srcset = candidates;
+    else source.removeAttribute("srcset");
+  });
+  bossImage.src = src;
+}
+
+// Upcoming bosses' portraits, fetched while the browser is idle so the next
+// boss shows up with its image already decoded. A detached <picture> with the
+// page's sizes makes the browser pick the same variant it will display.
+const preloadedBossImages = new Map();
+const whenIdle = window.requestIdleCallback ?? ((callback) => setTimeout(callback, 200));
+
+function preloadBossImages(hints) {
+  (hints ?? []).forEach((hint) => {
+    if (!hint.boss_image || preloadedBossImages.has(hint.boss_image)) return;
+    preloadedBossImages.set(hint.boss_image, null);
+    whenIdle(() => {
+      const picture = document.createElement("picture");
+      bossImageSources.forEach((pageSource) => {
+        const candidates = hint.boss_image_srcset?.[pageSource.type];
+        if (!candidates) return;
+        const source = document.createElement("source");
+        source.type = pageSource.type;
+        source.sizes = pageSource.sizes;
+        source.srcset = candidates;
+        picture.appendChild(source);
+      });
+      const img = document.createElement("img");
+      img.fetchPriority = "low";
+      img.decoding = "async";
+      img.width = bossImage.width;
+      img.height = bossImage.height;
+      picture.appendChild(img);
+      img.src = hint.boss_image;
+      img.decode().catch(() => {});
+      preloadedBossImages.set(hint.boss_image, img);
+    });
+  });
+}
+
 function renderGameData(data) {
   const boss = data.boss ?? {};
   bossName.textContent = boss.name ?? "Boss";
   bossCategory.textContent = boss.category ?? "";
 
-  if (data.boss_image) bossImage.src = data.boss_image;
+  if (data.boss_image) setBossImage(data.boss_image, data.boss_image_srcset);
+  preloadBossImages(data.preload_boss_images);
 
   if (boss.name && boss.name !== currentBossName) {
     currentBossName = boss.name;
@@ -677,11 +818,16 @@ function renderGameData(data) {
   setBars({ playerHp: data.player_hp, bossHp: boss.hp });
   setPlayerStats(data);
 
-  // Apply typewriter effect to scene text asynchronously
-  const sceneContent = data.scene ?? "...";
-  typewriterScene(sceneText, sceneContent);
-  
-  setChoices(data.choices ?? []);
+  if (data.scene_stream) {
+    // No scene was ready: stream it straight into the typewriter
+    streamScene(sceneText);
+  } else {
+    // Apply typewriter effect to scene text asynchronously
+    const sceneContent = data.scene ?? "...";
+    typewriterScene(sceneText, sceneContent);
+
+    setChoices(data.choices ?? []);
+  }
 
   const wins = Number(data.wins ?? 0) || 0;
   const required = Number(data.required_wins ?? 0) || 0;
@@ -793,8 +939,8 @@ async function applyChoice(choiceId) {
   if (turnFeedback) turnFeedback.textContent = "Resolving...";
   let outcome = null;
 
-  // Stop prefetch polling while we process the choice
-  stopPrefetchPolling();
+  // Close the prefetch channel while we process the choice
+  stopPrefetchEvents();
 
   try {
     const res = await fetch("/api/apply_choice", {
@@ -0,0 +1,391 @@
+"""Local stand-in for the OpenAI Responses API, for offline load tests and benchmarks.
+
+    python stub_server.py --profile typical --port 8787
+    OPENAI_BASE_URL=http://127.0.0.1:8787/v1 gunicorn app:app --threads 16
+
+Serves POST /v1/responses (plain and `stream: true`) with valid-looking
+scenes for the app's prompts, after a simulated latency, and fails, hangs,
+rate-limits or returns malformed output at configurable rates. Latency
+scales with the request's reasoning effort. GET /stats reports what it has
+served, by model and effort. Benchmarks can run it in-process with
+`start_stub_server()`.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, fields, replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class StubProfile:
+    latency_ms: float = 800.0  # median time to first token
+    latency_sigma: float = 0.5  # log-normal spread of that latency (0 = fixed)
+    tokens_per_second: float = 80.0  # output pacing (0 = all at once)
+    error_rate: float = 0.0  # share of calls answered with `error_status`
+    error_status: int = 500
+    malformed_rate: float = 0.0  # share of answers that break the scene format
+    hang_rate: float = 0.0  # share of calls that stall for `hang_seconds`
+    hang_seconds: float = 120.0
+    max_concurrency: int = 0  # calls beyond this get 429 (0 = unlimited)
+
+
+PROFILES: Dict[str, StubProfile] = {
+    "instant": StubProfile(latency_ms=0, latency_sigma=0, tokens_per_second=0),
+    "fast": StubProfile(latency_ms=300, latency_sigma=0.3, tokens_per_second=200),
+    "typical": StubProfile(error_rate=0.01, malformed_rate=0.03),
+    "slow": StubProfile(latency_ms=3000, latency_sigma=0.6, tokens_per_second=30, error_rate=0.02, malformed_rate=0.05),
+    "flaky": StubProfile(
+        latency_ms=1000, latency_sigma=1.0, tokens_per_second=60,
+        error_rate=0.15, malformed_rate=0.15, hang_rate=0.05, hang_seconds=60,
+    ),
+}
+
+# Reasoning effort scales time to first token, like a reasoning model thinking longer
+EFFORT_LATENCY = {"minimal": 0.4, "low": 0.7, "medium": 1.0, "high": 1.8}
+
+MALFORMED_KINDS = ("truncated", "prose", "wrong_count", "duplicate_ids", "extra_choice")
+
+
+# === Scene text === #
+_OPENERS = [
+    "{boss} bursts out of a cloud of smog above the {place}.",
+    "A rumble shakes the {place} as {boss} rises from a heap of junk.",
+    "{boss} has taken over the {place}, and the air tastes of smoke.",
+    "You spot {boss} creeping along the edge of the {place}.",
+    "Sirens wail across the {place}: {boss} is back.",
+]
+_DETAILS = [
+    "Puddles of {thing} glint under flickering lights.",
+    "Somewhere a {animal} calls for help.",
+    "Your {gadget} beeps a warning as the {thing} spreads.",
+    "Neighbors peek from windows, hoping someone will act.",
+    "The ground is littered with {thing} and broken glass.",
+    "A {animal} darts past you, fleeing the mess.",
+    "Wind carries {thing} across the {place}.",
+]
+_PLACES = ["schoolyard", "river bank", "city park", "harbor", "market", "forest trail", "rooftop garden", "beach"]
+_THINGS = ["oily sludge", "plastic wrappers", "soot", "foam cups", "bottle caps", "chemical foam", "food scraps"]
+_ANIMALS = ["heron", "turtle", "fox", "owl", "honeybee", "otter", "sparrow"]
+_GADGETS = ["eco-scanner", "compass", "walkie-talkie", "solar lamp", "field notebook"]
+_GOOD_VERBS = ["Recycle", "Compost", "Repair", "Reuse", "Plant", "Collect", "Sort", "Share", "Clean", "Protect"]
+_BAD_VERBS = ["Burn", "Dump", "Toss", "Waste", "Idle", "Spill", "Litter", "Trample", "Bury", "Shred"]
+_OBJECTS = [
+    "the bottles", "old batteries", "leftover food", "broken toys", "paper bags", "the tires",
+    "spare lumber", "garden hoses", "the cans", "torn clothes", "seed packets", "cardboard boxes",
+]
+_WHERE = ["by the creek", "at school", "near the pond", "in the park", "at home", "downtown", "on the trail"]
+
+
+def _choice(rng: random.Random, sustainable: bool) -> Dict[str, Any]:
+    verb = rng.choice(_GOOD_VERBS if sustainable else _BAD_VERBS)
+    return {
+        "text": f"{verb} {rng.choice(_OBJECTS)} {rng.choice(_WHERE)}.",
+        "is_sustainable": sustainable,
+        "delta_player": {"hp": 0 if sustainable else -rng.randint(3, 6)},
+        "delta_boss": {"hp": -rng.randint(9, 12) if sustainable else -rng.randint(0, 2)},
+    }
+
+
+def make_scene(rng: random.Random, boss: str, sustainable_needed: int) -> Dict[str, Any]:
+    place = rng.choice(_PLACES)
+    fill = {
+        "boss": boss, "place": place, "thing": rng.choice(_THINGS),
+        "animal": rng.choice(_ANIMALS), "gadget": rng.choice(_GADGETS),
+    }
+    sentences = [rng.choice(_OPENERS)] + rng.sample(_DETAILS, 2) + [f"Act now, hero #{rng.randint(100, 999)}!"]
+    flags = [True] * sustainable_needed + [False] * (4 - sustainable_needed)
+    rng.shuffle(flags)
+    choices = [{"id": chr(65 + i), **_choice(rng, flag)} for i, flag in enumerate(flags)]
+    # "scene" first, like the real model under the app's schema
+    return {"scene": " ".join(s.format(**fill) for s in sentences), "choices": choices}
+
+
+def _malform(rng: random.Random, payload: Dict[str, Any], text: str) -> Tuple[str, str]:
+    kind = rng.choice(MALFORMED_KINDS)
+    scenes = payload.get("scenes") or [payload]
+    if kind == "truncated":
+        return kind, text[: rng.randint(1, max(1, len(text) - 1))]
+    if kind == "prose":
+        return kind, f"Sure! Here is the battle:\n```json\n{text}\n```\nHave fun!"
+    scene = rng.choice(scenes)
+    if kind == "wrong_count":
+        scene["choices"][rng.randrange(4)]["is_sustainable"] ^= True
+    elif kind == "duplicate_ids":
+        scene["choices"][1]["id"] = scene["choices"][0]["id"]
+    else:
+        scene["choices"].append({"id": "E", **_choice(rng, False)})
+    return kind, json.dumps(payload)
+
+
+# === Request handling === #
+def _request_text(body: Dict[str, Any]) -> Tuple[str, str]:
+    """(system text, user text) of a responses.create body."""
+    items = body.get("input")
+    if isinstance(items, str):
+        return body.get("instructions") or "", items
+    system, user = [body.get("instructions") or ""], []
+    for item in items or []:
+        content = item.get("content", "")
+        if isinstance(content, list):
+            content = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+        (system if item.get("role") in ("system", "developer") else user).append(str(content))
+    return "\n".join(filter(None, system)), "\n".join(user)
+
+
+def _scene_count(body: Dict[str, Any], prompt: str) -> int:
+    name = ((body.get("text") or {}).get("format") or {}).get("name", "")
+    match = re.match(r"scenes_(\d+)$", name) or re.search(r"Return (\d+) scenes?", prompt)
+    return max(1, int(match.group(1))) if match else 1
+
+
+class StubState:
+    def __init__(self, profile: StubProfile, seed: Optional[int] = None) -> None:
+        self.profile = profile
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.cache_keys: set = set()
+        self.counts: Dict[str, int] = {
+            "requests": 0, "streamed": 0, "errors": 0, "rate_limited": 0, "hung": 0,
+            "malformed": 0, "scenes": 0, "in_flight": 0, "peak_in_flight": 0,
+        }
+        self.malformed_kinds: Dict[str, int] = {kind: 0 for kind in MALFORMED_KINDS}
+        self.models: Dict[str, int] = {}
+
+    def bump(self, key: str, by: int = 1) -> None:
+        with self.lock:
+            self.counts[key] += by
+            if key == "in_flight":
+                self.counts["peak_in_flight"] = max(self.counts["peak_in_flight"], self.counts["in_flight"])
+
+    def latency(self, body: Dict[str, Any]) -> float:
+        p = self.profile
+        effort = (body.get("reasoning") or {}).get("effort") or "medium"
+        with self.lock:
+            z = self.rng.gauss(0, 1)
+            route = f"{body.get('model', 'stub')}/{effort}"
+            self.models[route] = self.models.get(route, 0) + 1
+        return p.latency_ms / 1000 * EFFORT_LATENCY.get(effort, 1.0) * math.exp(p.latency_sigma * z)
+
+    def usage(self, body: Dict[str, Any], system: str, user: str, output: str) -> Dict[str, Any]:
+        system_tokens = len(system) // 4
+        input_tokens = system_tokens + len(user) // 4
+        cached = 0
+        key = body.get("prompt_cache_key") or system[:64]
+        with self.lock:
+            # Like the real cache: a repeated prefix of 1024+ tokens, in 128-token steps
+            if key in self.cache_keys and system_tokens >= 1024:
+                cached = system_tokens // 128 * 128
+            self.cache_keys.add(key)
+        output_tokens = max(1, len(output) // 4)
+        return {
+            "input_tokens": input_tokens,
+            "input_tokens_details": {"cached_tokens": cached},
+            "output_tokens": output_tokens,
+            "output_tokens_details": {"reasoning_tokens": 0},
+            "total_tokens": input_tokens + output_tokens,
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return {**self.counts, "malformed_kinds": dict(self.malformed_kinds), "models": dict(self.models), "profile": asdict(self.profile)}
+
+
+def _response_object(response_id: str, model: str, text: Optional[str], usage: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    output = []
+    if text is not None:
+        output.append({
+            "type": "message", "id": f"msg_{response_id[5:]}", "status": "completed", "role": "assistant",
+            "content": [{"type": "output_text", "text": text, "annotations": []}],
+        })
+    return {
+        "id": response_id, "object": "response", "created_at": int(time.time()),
+        "status": "completed" if text is not None else "in_progress",
+        "model": model, "output": output, "usage": usage, "error": None, "incomplete_details": None,
+        "instructions": None, "metadata": {}, "parallel_tool_calls": True, "temperature": 1.0,
+        "tool_choice": "auto", "tools": [], "top_p": 1.0,
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "BossRushStub/1"
+    stub: StubState  # set on the per-server subclass
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send_json(self, status: int, data: Dict[str, Any]) -> None:
+        raw = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def _send_error(self, status: int, message: str, kind: str) -> None:
+        self._send_json(status, {"error": {"message": message, "type": kind, "param": None, "code": None}})
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/") == "/stats":
+            self._send_json(200, self.stub.snapshot())
+        else:
+            self._send_error(404, "Not found.", "invalid_request_error")
+
+    def do_POST(self) -> None:
+        if self.path.rstrip("/") not in ("/v1/responses", "/responses"):
+            self._send_error(404, "Not found.", "invalid_request_error")
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+        except ValueError:
+            self._send_error(400, "Body is not JSON.", "invalid_request_error")
+            return
+
+        stub, profile = self.stub, self.stub.profile
+        stub.bump("requests")
+        with stub.lock:
+            over = profile.max_concurrency and stub.counts["in_flight"] >= profile.max_concurrency
+            roll_error, roll_hang, roll_malformed = stub.rng.random(), stub.rng.random(), stub.rng.random()
+        if over:
+            stub.bump("rate_limited")
+            self._send_error(429, "Rate limit reached.", "rate_limit_error")
+            return
+        stub.bump("in_flight")
+        try:
+            self._respond(body, roll_error, roll_hang, roll_malformed)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client gave up (deadline or cancelled stream)
+        finally:
+            stub.bump("in_flight", -1)
+
+    def _respond(self, body: Dict[str, Any], roll_error: float, roll_hang: float, roll_malformed: float) -> None:
+        stub, profile = self.stub, self.stub.profile
+        if roll_hang < profile.hang_rate:
+            stub.bump("hung")
+            time.sleep(profile.hang_seconds)
+        time.sleep(stub.latency(body))
+        if roll_error < profile.error_rate:
+            stub.bump("errors")
+            self._send_error(profile.error_status, "Simulated upstream failure.", "server_error")
+            return
+
+        system, prompt = _request_text(body)
+        boss = re.search(r"Boss: (.+?) \(", prompt)
+        sustainable = re.search(r"Sustainable choices per scene: (\d)", prompt)
+        count = _scene_count(body, prompt)
+        with stub.lock:
+            scenes = [
+                make_scene(stub.rng, boss.group(1) if boss else "The Boss", int(sustainable.group(1)) if sustainable else 1)
+                for _ in range(count)
+            ]
+        payload: Dict[str, Any] = scenes[0] if count == 1 else {"scenes": scenes}
+        text = json.dumps(payload)
+        if roll_malformed < profile.malformed_rate:
+            with stub.lock:
+                kind, text = _malform(stub.rng, payload, text)
+                stub.malformed_kinds[kind] += 1
+            stub.bump("malformed")
+        stub.bump("scenes", count)
+
+        response_id = f"resp_{uuid.uuid4().hex}"
+        model = body.get("model", "stub")
+        usage = stub.usage(body, system, prompt, text)
+        if not body.get("stream"):
+            if profile.tokens_per_second:
+                time.sleep(usage["output_tokens"] / profile.tokens_per_second)
+            self._send_json(200, _response_object(response_id, model, text, usage))
+            return
+        self._stream(response_id, model, text, usage)
+
+    def _stream(self, response_id: str, model: str, text: str, usage: Dict[str, Any]) -> None:
+        stub, profile = self.stub, self.stub.profile
+        stub.bump("streamed")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")  # the body ends when the socket closes
+        self.end_headers()
+        self.close_connection = True
+        sequence = 0
+
+        def event(kind: str, data: Dict[str, Any]) -> None:
+            nonlocal sequence
+            data = {"type": kind, "sequence_number": sequence, **data}
+            sequence += 1
+            self.wfile.write(f"event: {kind}\ndata: {json.dumps(data)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        item_id = f"msg_{response_id[5:]}"
+        part = {"type": "output_text", "text": "", "annotations": []}
+        event("response.created", {"response": _response_object(response_id, model, None, None)})
+        event("response.output_item.added", {
+            "output_index": 0,
+            "item": {"type": "message", "id": item_id, "status": "in_progress", "role": "assistant", "content": []},
+        })
+        event("response.content_part.added", {"item_id": item_id, "output_index": 0, "content_index": 0, "part": part})
+        step = 16  # characters per delta, about four tokens
+        pause = step / 4 / profile.tokens_per_second if profile.tokens_per_second else 0.0
+        for i in range(0, len(text), step):
+            event("response.output_text.delta", {
+                "item_id": item_id, "output_index": 0, "content_index": 0,
+                "delta": text[i : i + step], "logprobs": [],
+            })
+            if pause:
+                time.sleep(pause)
+        event("response.output_text.done", {
+            "item_id": item_id, "output_index": 0, "content_index": 0, "text": text, "logprobs": [],
+        })
+        done = _response_object(response_id, model, text, usage)
+        event("response.content_part.done", {
+            "item_id": item_id, "output_index": 0, "content_index": 0, "part": {**part, "text": text},
+        })
+        event("response.output_item.done", {"output_index": 0, "item": done["output"][0]})
+        event("response.completed", {"response": done})
+
+
+def start_stub_server(
+    profile: StubProfile, host: str = "127.0.0.1", port: int = 0, seed: Optional[int] = None
+) -> Tuple[ThreadingHTTPServer, str]:
+    """Serve in a daemon thread; returns the server and its base URL (…/v1).
+    Port 0 picks a free port. Stop it with `server.shutdown()`."""
+    state = StubState(profile, seed)
+    handler = type("BoundStubHandler", (StubHandler,), {"stub": state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.stub = state  # type: ignore[attr-defined]
+    threading.Thread(target=server.serve_forever, name="stub-server", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/v1"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="typical")
+    parser.add_argument("--seed", type=int, default=None)
+    for f in fields(StubProfile):
+        parser.add_argument(f"--{f.name.replace('_', '-')}", type=type(f.default), default=None)
+    args = parser.parse_args()
+
+    overrides = {f.name: getattr(args, f.name) for f in fields(StubProfile) if getattr(args, f.name) is not None}
+    profile = replace(PROFILES[args.profile], **overrides)
+    server, base_url = start_stub_server(profile, args.host, args.port, args.seed)
+    print(f"stub serving {base_url} ({args.profile}: {asdict(profile)})")
+    print(f"point the app at it: OPENAI_BASE_URL={base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llm_gateway import LLMGateway  # noqa: E402
+
+
+class _Response:
+    output_text = "ok"
+    usage = None
+
+
+class _Responses:
+    """Prefetch calls (model="prefetch") hang until `release` is set."""
+
+    def __init__(self) -> None:
+        self.release = threading.Event()
+
+    async def create(self, model: str, **kwargs):
+        if model == "prefetch":
+            while not self.release.is_set():
+                await asyncio.sleep(0.01)
+        return _Response()
+
+
+class _Client:
+    def __init__(self) -> None:
+        self.responses = _Responses()
+
+
+def test_interactive_create_skips_per_session_permits_held_by_prefetch():
+    client = _Client()
+    gateway = LLMGateway(lambda: client, max_in_flight=8, max_per_session=2)
+    prefetch = [gateway.submit("s1", model="prefetch") for _ in range(2)]
+    try:
+        # Both of the session's permits are taken: a plain call has to wait
+        with pytest.raises(TimeoutError):
+            gateway.create("s1", timeout=0.2, model="scene")
+        response = gateway.create("s1", timeout=1.0, interactive=True, model="scene")
+        assert response.output_text == "ok"
+        assert not any(future.done() for future in prefetch)
+    finally:
+        client.responses.release.set()
+    for future in prefetch:
+        assert future.result(timeout=2).output_text == "ok"